@@ -0,0 +1,252 @@
+import math
+import random
+import time
+
+from IncrementalEvaluator import IncrementalEvaluator
+from GreedyBuilder import GreedyBuilder
+from MoveIndex import MoveIndex
+
+
+class Annealer:
+    """Simulated annealing over integer assignments of a BattleEngine.
+
+    Moves either retarget one slot (two with 20% chance) to a head the player
+    can damage, drawn from a MoveIndex, or swap one slot between two players
+    (`swap_rate`). They are scored through an IncrementalEvaluator instead of
+    replaying the whole assignment. With a ScoreCache, moves back to an
+    assignment seen before are accepted or rejected from the cached score and
+    only replayed when accepted.
+    """
+
+    def __init__(self, engine, rng=None, move_index=None, swap_rate=0.1, cache=None):
+        self.engine = engine
+        self.cache = cache
+        self.rng = rng if rng is not None else random.Random(random.getrandbits(64))
+        self.moves = move_index if move_index is not None else MoveIndex(engine)
+        self.swap_rate = swap_rate
+        self.steps = 0        # players replayed by the last run()
+        self.evaluations = 0  # moves scored by the last run()
+        self.best_elapsed = 0.0  # seconds into the last run() when its best score was found
+
+        # Move statistics, accumulated over every run of this annealer
+        self.last_move = None
+        self.move_counts = {"retarget": 0, "swap": 0}
+        self.move_rejections = {"retarget": 0, "swap": 0}
+        self.failed_mutations = 0
+
+        # Heads that are alive at the start of the battle, grouped by hydra
+        self.hydra_heads = []
+        head_hydra = engine.head_hydra.tolist()
+        start_health = engine.start_health.tolist()
+        for hydra_id in range(len(engine.hydra_names)):
+            heads = [head_id for head_id in range(engine.n_heads)
+                     if head_hydra[head_id] == hydra_id and start_health[head_id] > 0]
+            if heads:
+                self.hydra_heads.append(heads)
+
+    def random_target(self):
+        return self.rng.choice(self.rng.choice(self.hydra_heads))
+
+    def random_targets(self):
+        if not self.hydra_heads:
+            return [[-1] * self.engine.SLOTS for _ in range(self.engine.n_players)]
+        return [[self.random_target() for _ in range(self.engine.SLOTS)]
+                for _ in range(self.engine.n_players)]
+
+    def initial_targets(self, seeding="random", randomness=0.2):
+        # "random": uniform targets, "greedy": GreedyBuilder, "greedy-randomized": a randomized greedy variant
+        if seeding == "greedy":
+            return GreedyBuilder(self.engine, self.rng).build()
+        if seeding == "greedy-randomized":
+            return GreedyBuilder(self.engine, self.rng).build(randomness=randomness)
+        return self.random_targets()
+
+    def mutate(self, targets, retry_limit=5):
+        # Returns [(player_id, slot, head_id), ...] without touching targets
+        moves = self.moves
+        rng = self.rng
+        slots = self.engine.SLOTS
+        changes = []
+
+        if len(moves.players) > 1 and rng.random() < self.swap_rate:
+            # Exchange one slot between two players, if both can damage their new target
+            kind = "swap"
+            for _ in range(retry_limit):
+                player_a, player_b = rng.sample(moves.players, 2)
+                slot_a, slot_b = rng.randrange(slots), rng.randrange(slots)
+                head_a, head_b = targets[player_a][slot_a], targets[player_b][slot_b]
+                if head_a != head_b and moves.can_damage(player_a, head_b) and moves.can_damage(player_b, head_a):
+                    changes = [(player_a, slot_a, head_b), (player_b, slot_b, head_a)]
+                    break
+        elif moves.players:
+            # Retarget one slot, two with 20% chance, to a head the player can damage
+            kind = "retarget"
+            pending = {}
+            mutations = 2 if rng.random() < 0.2 else 1
+            for _ in range(mutations):
+                for _ in range(retry_limit):
+                    player_id = rng.choice(moves.players)
+                    slot = rng.randrange(slots)
+                    head_id = moves.sample(player_id, rng)
+                    if pending.get((player_id, slot), targets[player_id][slot]) != head_id:
+                        pending[(player_id, slot)] = head_id
+                        changes.append((player_id, slot, head_id))
+                        break
+                # If retries exhausted, just skip this mutation
+        else:
+            return changes
+
+        self.last_move = kind
+        if changes:
+            self.move_counts[kind] += 1
+        else:
+            self.failed_mutations += 1
+        return changes
+
+    def mutation_rate(self):
+        # Share of mutate() calls that produced a move
+        proposed = sum(self.move_counts.values())
+        total = proposed + self.failed_mutations
+        return proposed / total if total else 0.0
+
+    def rejection_rate(self, kind=None):
+        # Share of proposed moves (of one kind, or all) rejected by the Metropolis test
+        kinds = [kind] if kind else list(self.move_counts)
+        proposed = sum(self.move_counts[k] for k in kinds)
+        rejected = sum(self.move_rejections[k] for k in kinds)
+        return rejected / proposed if proposed else 0.0
+
+    def run(self, max_iter=20000, initial_temp=1000, cooling_rate=0.995,
+            reheat_every=2000, patience=5000, initial=None, deadline=None, stop_event=None,
+            seeding="random", telemetry=None, target_score=None, objective=None):
+        # deadline (time.monotonic()) and stop_event end the run early with the best so far,
+        # and so does reaching target_score. With a RobustnessEvaluator as objective, its
+        # expected or quantile score is maximized (and returned) instead of the max-hit score.
+        temperature = initial_temp
+        no_improve_counter = 0
+        accepted = rejected = reheats = 0
+        trace_every = telemetry.trace_every if telemetry is not None else 0
+        chain = telemetry.new_chain() if telemetry is not None else None
+
+        self.evaluations = 1
+        started = time.perf_counter()
+        if initial is None:
+            initial = self.initial_targets(seeding)
+        if objective is not None:
+            evaluator = objective.incremental(initial)
+        else:
+            evaluator = IncrementalEvaluator(self.engine, initial)
+        best_score = evaluator.score
+        best_targets = [row[:] for row in evaluator.targets]
+        self.best_elapsed = time.perf_counter() - started
+
+        cache = self.cache if objective is None else None  # cached scores are max-hit scores
+        cache_hits = 0
+        if cache is not None:
+            key = cache.key(evaluator.targets)
+            cache.put(key, evaluator.score)
+
+        for i in range(max_iter):
+            if temperature < 1e-5:
+                break
+
+            if i % 256 == 0 and ((deadline is not None and time.monotonic() >= deadline)
+                                 or (stop_event is not None and stop_event.is_set())):
+                break
+
+            if i > 0 and i % reheat_every == 0:
+                temperature = initial_temp  # reheat
+                reheats += 1
+
+            if trace_every and i % trace_every == 0:
+                telemetry.sample(chain, i, temperature, evaluator.score, best_score)
+
+            changes = self.mutate(evaluator.targets)
+            if not changes:
+                no_improve_counter += 1
+                temperature *= cooling_rate
+                continue
+
+            current_score = evaluator.score
+            new_score = None
+            if cache is not None:
+                new_key = cache.rekey(key, evaluator.targets, changes)
+                new_score = cache.get(new_key)
+            replayed = new_score is None
+            if replayed:
+                new_score = evaluator.apply(changes)
+                if cache is not None:
+                    cache.put(new_key, new_score)
+            else:
+                cache_hits += 1
+            self.evaluations += 1
+            delta = new_score - current_score
+
+            if delta > 0 or self.rng.random() < math.exp(delta / temperature):
+                if not replayed:
+                    evaluator.apply(changes)  # cached score, the checkpoints still need the move
+                evaluator.accept()
+                if cache is not None:
+                    key = new_key
+                accepted += 1
+                if new_score > best_score:
+                    best_score = new_score
+                    best_targets = [row[:] for row in evaluator.targets]
+                    self.best_elapsed = time.perf_counter() - started
+                    no_improve_counter = 0
+                    if target_score is not None and best_score >= target_score:
+                        break
+                else:
+                    no_improve_counter += 1
+            else:
+                if replayed:
+                    evaluator.reject()
+                rejected += 1
+                self.move_rejections[self.last_move] += 1
+                no_improve_counter += 1
+
+            if no_improve_counter > patience:
+                break
+
+            temperature *= cooling_rate
+
+        self.steps = evaluator.steps
+        if telemetry is not None:
+            telemetry.count(evaluations=self.evaluations, accepted=accepted, rejected=rejected, reheats=reheats)
+            if cache is not None:
+                telemetry.count(cache_hits=cache_hits, cache_misses=self.evaluations - 1 - cache_hits)
+        return best_targets, best_score
+
+    def sample(self, targets, temperature, n_steps, target_score=None):
+        # Fixed-temperature Metropolis segment, used by parallel tempering replicas.
+        # Ends early once the best score reaches target_score.
+        # Returns (targets, score, best_targets, best_score, accepted moves)
+        evaluator = IncrementalEvaluator(self.engine, targets)
+        best_score = evaluator.score
+        best_targets = [row[:] for row in evaluator.targets]
+        accepted = 0
+
+        steps = 0
+        for _ in range(n_steps):
+            if target_score is not None and best_score >= target_score:
+                break
+            steps += 1
+            changes = self.mutate(evaluator.targets)
+            if not changes:
+                continue
+
+            current_score = evaluator.score
+            new_score = evaluator.apply(changes)
+            delta = new_score - current_score
+            if delta >= 0 or self.rng.random() < math.exp(delta / temperature):
+                evaluator.accept()
+                accepted += 1
+                if new_score > best_score:
+                    best_score = new_score
+                    best_targets = [row[:] for row in evaluator.targets]
+            else:
+                evaluator.reject()
+                self.move_rejections[self.last_move] += 1
+
+        self.evaluations = steps
+        return evaluator.targets, evaluator.score, best_targets, best_score, accepted
@@ -0,0 +1,70 @@
+import itertools
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "annealing_settings.json")
+
+
+class AnnealingSettings:
+    """Tuned Annealer.run settings, stored per sheet shape in a JSON file.
+
+    A shape is the player count rounded up to a power of two plus the hydras
+    and head count, so a tuned sheet's settings also apply to the next
+    cycle's sheet of the guild. candidates() spans the search space used by
+    main.tune_annealing: temperatures are multiples of the median head worth
+    of the sheet, since the Metropolis test compares score changes (whole
+    head worths) against the temperature. max_iter is kept fixed, so every
+    candidate gets the same budget and a longer run can't win by being longer.
+    """
+
+    DEFAULTS = {"max_iter": 20000, "initial_temp": 1000, "cooling_rate": 0.995, "reheat_every": 2000,
+                "patience": 5000}
+    TEMPERATURE_SCALES = [0.25, 0.5, 1, 2, 4, 8]
+    COOLING_RATES = [0.99, 0.995, 0.998, 0.999]
+    REHEAT_EVERY = [500, 2000, 5000]
+    PATIENCE = [2000, 5000, 10000]
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+
+    @staticmethod
+    def shape(engine):
+        players = 2 ** math.ceil(math.log2(max(engine.n_players, 1)))
+        return f"players<={players}/heads={len(engine.head_ids)}/{'+'.join(engine.hydra_names)}"
+
+    def candidates(self, engine, n_configs, rng):
+        # The defaults first, then a random sample of the grid
+        worth_scale = float(np.median(engine.worth_table))
+        grid = [{"max_iter": self.DEFAULTS["max_iter"], "initial_temp": round(scale * worth_scale, 1),
+                 "cooling_rate": cooling_rate, "reheat_every": reheat_every, "patience": patience}
+                for scale, cooling_rate, reheat_every, patience in itertools.product(
+                    self.TEMPERATURE_SCALES, self.COOLING_RATES, self.REHEAT_EVERY, self.PATIENCE)]
+        return [dict(self.DEFAULTS)] + rng.sample(grid, min(n_configs - 1, len(grid)))
+
+    def load_all(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as settings_file:
+                return json.load(settings_file)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Could not read annealing settings {self.path}: {e}")
+            return {}
+
+    def lookup(self, engine):
+        # Tuned options for this sheet's shape, or None
+        entry = self.load_all().get(self.shape(engine))
+        return dict(entry["options"]) if entry else None
+
+    def save(self, engine, options, mean_score, sheet=None):
+        entries = self.load_all()
+        entries[self.shape(engine)] = {"options": options, "mean_score": mean_score, "sheet": sheet,
+                                       "tuned_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        temp_path = self.path + ".tmp"
+        with open(temp_path, mode='w', encoding='utf-8') as out:
+            json.dump(entries, out, indent=2)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,109 @@
+import csv
+
+
+class AssignmentReport:
+    """Per-target breakdown of one assignment, built in a single pass.
+
+    Attacks are grouped by head id straight from the (players, 3) target
+    array, damages come from the engine's damage rows, and kills from the
+    engine's final battle state. print_summary() and the CSV writer both
+    render from this one model, in the sheet's column order (`columns`).
+    Both also show how far the score is from the sheet's upper bound.
+    """
+
+    def __init__(self, engine, targets, score, columns):
+        self.engine = engine
+        self.score = score
+        self.columns = list(columns)
+        self.column_heads = {f"{head} - {hydra}": head_id for (hydra, head), head_id in engine.head_ids.items()}
+
+        # head id -> [(player_name, damage), ...] in attack order
+        self.attacks = {}
+        for player_id, row in enumerate(targets.tolist() if hasattr(targets, "tolist") else targets):
+            damage_row = engine._damage_rows[player_id]
+            for head_id in row:
+                if head_id >= 0:
+                    self.attacks.setdefault(head_id, []).append((engine.player_names[player_id], damage_row[head_id]))
+
+        engine.evaluate(targets)
+        self.final_health = engine.health.tolist()
+        self.heads_killed = sum(1 for head_id, hp in enumerate(self.final_health)
+                                if hp <= 0 and engine.head_names[head_id] is not None)
+        self.total_heads = len(engine.head_ids)
+        self.upper_bound = engine.upper_bound()
+        self.gap = max(self.upper_bound - score, 0)
+
+    @classmethod
+    def from_assignment(cls, engine, assignment, score, columns):
+        return cls(engine, engine.encode(assignment), score, columns)
+
+    def print_summary(self):
+        start_health = self.engine._start_health
+
+        print("\n[DETAILED TARGET BREAKDOWN]")
+        print("-" * 50)
+
+        # Print by original CSV order
+        for target in self.columns:
+            head_id = self.column_heads.get(target)
+            if head_id not in self.attacks:
+                continue
+
+            print(f"\n{target}:")
+            total_damage = 0
+            for player_name, damage in self.attacks[head_id]:
+                if damage == 0:
+                    continue  # Skip players with 0 damage
+                total_damage += damage
+                print(f"  {player_name:<20} {damage:>12,}")
+
+            remaining_hp = max(start_health[head_id] - total_damage, 0)
+            print(f"{'REMAINING HP':<22} {remaining_hp:>12,}")
+
+        print("-" * 50)
+
+        # Print final summary
+        print("\n[FINAL SUMMARY]")
+        print(f"Total heads killed: {self.heads_killed} / {self.total_heads}")
+        print(f"Total score: {self.score:,}")
+        print(f"Upper bound: {self.upper_bound:,} (at most {self.gap:,} more is possible)")
+
+    def csv_rows(self):
+        # Yields the rows of the long summary CSV one at a time
+        start_health = self.engine._start_health
+        yield ["Target", "Person", "Damage", "Target Total"]
+
+        targets_killed = 0
+        for target in self.columns:
+            head_id = self.column_heads.get(target)
+            players = self.attacks.get(head_id, [])
+            if not players:
+                # No one attacked this target
+                yield [target, "", "❌ Unreachable", 0]
+                yield [target, "", "❌ Unreachable", 0]
+                continue
+
+            # Only the strongest hits needed to reach the kill threshold
+            accumulated = 0
+            for player_name, damage in sorted(players, key=lambda x: x[1], reverse=True):
+                if damage == 0 or accumulated >= start_health[head_id]:
+                    break
+                yield [target, player_name, damage, ""]
+                accumulated += damage
+
+            if accumulated >= start_health[head_id]:
+                yield [target, "", "✅ Reached", start_health[head_id]]
+                targets_killed += 1
+            else:
+                yield [target, "", "❌ Not Reached", 0]
+
+        yield []
+        yield ["Targets Killed", targets_killed, "", ""]
+        yield ["Total Value", self.score, "", ""]
+        yield ["Upper Bound", self.upper_bound, "", ""]
+        yield ["Gap", self.gap, "", ""]
+
+    def write_csv(self, filename):
+        # Rows are streamed to disk as they are produced, so very large sheets never sit in memory
+        with open(filename, mode='w', newline='', encoding='utf-8') as csvfile:
+            csv.writer(csvfile).writerows(self.csv_rows())
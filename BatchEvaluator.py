@@ -0,0 +1,54 @@
+import numpy as np
+
+
+class BatchEvaluator:
+    """Scores a whole population of assignments at once.
+
+    A population is an integer array of shape (N, players, 3) of head ids
+    (-1 = no attack), as produced by BattleEngine.encode. Every candidate
+    walks the attack order in lockstep, so each (player, slot) step is a
+    handful of NumPy operations over all N battle states.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.damage = engine.damage
+        self.start_health = engine.start_health
+        self.head_hydra = engine.head_hydra
+        self.worth_table = engine.worth_table
+        self.max_kills = engine.max_kills
+
+    def evaluate(self, population):
+        population = np.asarray(population, dtype=np.int64)
+        n = len(population)
+        rows = np.arange(n)
+
+        health = np.tile(self.start_health, (n, 1))
+        kills = np.zeros((n, len(self.engine.hydra_names)), dtype=np.int64)
+        scores = np.zeros(n, dtype=np.int64)
+
+        for player_id in range(population.shape[1]):
+            damage_row = self.damage[player_id]
+            for slot in range(population.shape[2]):
+                heads = population[:, player_id, slot]
+                valid = heads >= 0
+                heads = np.where(valid, heads, 0)
+
+                hp = health[rows, heads]
+                damage = damage_row[heads]
+                hit = valid & (hp > 0) & (damage > 0)
+                if not hit.any():
+                    continue
+
+                new_hp = np.where(hit, np.maximum(hp - damage, 0), hp)
+                health[rows, heads] = new_hp
+
+                killed = hit & (new_hp == 0)
+                if killed.any():
+                    hydras = self.head_hydra[heads]
+                    killed_before = kills[rows, hydras]
+                    worth = self.worth_table[np.minimum(killed_before, self.max_kills), hydras]
+                    scores += np.where(killed, worth, 0)
+                    kills[rows, hydras] = killed_before + killed
+
+        return scores
@@ -0,0 +1,84 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+
+class Checkpoint:
+    """Progress of a long run, saved as one small JSON file.
+
+    Holds the best assignments (by player and head name, so they also work
+    as warm starts after the sheet was edited), the parent's RNG state and
+    the run counters. save() writes a temporary file next to the target,
+    fsyncs it and renames it over the old one, so a crash mid-write leaves
+    the previous checkpoint intact. fingerprint() tells whether a checkpoint
+    belongs to the exact same sheet, which resuming requires.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def fingerprint(engine):
+        digest = hashlib.sha1()
+        digest.update(json.dumps([engine.player_names, engine.hydra_names, engine.head_names]).encode())
+        digest.update(engine.damage.astype(np.int64).tobytes())
+        digest.update(engine.start_health.tobytes())
+        return digest.hexdigest()[:16]
+
+    @staticmethod
+    def best_entries(engine, results, keep=8):
+        # [(targets, score), ...] -> the `keep` best as JSON-ready entries
+        best = sorted(results, key=lambda result: result[1], reverse=True)[:keep]
+        return [{"score": score, "assignment": engine.decode(targets)} for targets, score in best]
+
+    @staticmethod
+    def rng_state(rng):
+        return list(rng.getstate())
+
+    @staticmethod
+    def restore_rng(rng, state):
+        version, internal, gauss_next = state
+        rng.setstate((version, tuple(internal), gauss_next))
+
+    def save(self, state):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".checkpoint-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, mode='w', encoding='utf-8') as out:
+                json.dump(dict(state, version=self.VERSION), out, separators=(",", ":"))
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def load(self):
+        # The saved state, or None when there is no usable checkpoint
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, encoding='utf-8') as checkpoint_file:
+                state = json.load(checkpoint_file)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Could not read checkpoint {self.path}: {e}")
+            return None
+        if state.get("version") != self.VERSION:
+            print(f"[WARN] Checkpoint {self.path} has an unsupported version, ignoring it.")
+            return None
+        return state
+
+    def warm_starts(self, engine):
+        # Stored assignments as target arrays for `engine`, best first
+        state = self.load()
+        if state is None:
+            return []
+        return [engine.encode({player: [tuple(target) for target in targets]
+                               for player, targets in entry["assignment"].items()}).tolist()
+                for entry in state.get("best", [])]
@@ -1,16 +1,28 @@
 import random
-import copy
+import time
+from itertools import combinations_with_replacement
+
+import numpy as np
+
+from BattleEngine import BattleEngine
+from RandomRestart import RandomRestart
+from TabuSearch import TabuSearch
 
 class Cycle:
-    def __init__(self, players, hydras):
+    def __init__(self, players, hydras, damage_matrix=None):
         self.players = players
         self.hydras = hydras
         self.current_value = 0
 
-        # Cache for quick lookup
+        # Damage lookups read the precompiled (players x heads) matrix by index
+        if damage_matrix is None:
+            damage_matrix = [player.maxDmgs for player in sorted(players, key=lambda p: p.index)]
+        self.damage_matrix = np.asarray(damage_matrix, dtype=np.int64)
+        self.damage_rows = self.damage_matrix.tolist()
+
+        # Cache for quick lookup, kept here so the shared Hydra objects stay untouched
         self.hydra_dict = {h.name: h for h in hydras}
-        for hydra in hydras:
-            hydra.head_dict = {head.name: head for head in hydra.heads}
+        self.head_dict = {(hydra.name, head.name): head for hydra in hydras for head in hydra.heads}
 
     def apply_assignment(self, assignment):
         self.current_value = 0
@@ -31,11 +43,11 @@ class Cycle:
                 if not hydra:
                     continue
 
-                head = hydra.head_dict.get(head_name)
+                head = self.head_dict.get((hydra_name, head_name))
                 if not head or head.health <= 0:
                     continue
 
-                damage = player.DamageToHead(hydra, head)
+                damage = self.damage_rows[player.index][head.index]
                 if damage <= 0:
                     continue
 
@@ -50,53 +62,125 @@ class Cycle:
 
         return self.current_value
 
-    def brute_force(self, max_attempts=1000000):
-        best_assignment = None
-        best_value = 0
-
-        for attempt in range(max_attempts):
-            # Clone all hydras and reset state
-            hydras = [copy.deepcopy(hydra) for hydra in self.hydras]
-            players = [copy.deepcopy(player) for player in self.players]
-            
-            # Shuffle initial state
-            random.shuffle(players)
-            random.shuffle(hydras)
-            for hydra in hydras:
-                random.shuffle(hydra.heads)
-
-            total_value = 0
-            attack_log = []
-
-            for player in players:
-                for _ in range(3):  # 3 attacks per player
-                    # Get all alive heads across all hydras
-                    possible_targets = [
-                        (hydra, head)
-                        for hydra in hydras
-                        for head in hydra.heads
-                        if head.is_alive()
-                    ]
-                    if not possible_targets:
-                        break
-
-                    # Shuffle targets for extra randomness before picking the first
-                    random.shuffle(possible_targets)
-                    hydra, head = possible_targets[0]
-
-                    damage = player.DamageToHead(hydra, head)
-                    damage = damage if damage else 0
-
-                    head.health -= damage
-                    if head.health <= 0 and head.alive:
-                        head.alive = False
-                        hydra.on_head_killed()
-                        total_value += head.worth
-
-                    attack_log.append((player.name, hydra.name, head.name, damage, head.worth))
-
-            if total_value > best_value:
-                best_value = total_value
-                best_assignment = attack_log
-
+    def brute_force(self, max_attempts=1000000, target_score=None):
+        # Random restarts on one restorable array state, see RandomRestart
+        engine = BattleEngine(self.players, self.hydras, self.damage_matrix)
+        best_log, best_value = RandomRestart(engine).run(max_attempts=max_attempts, target_score=target_score)
+        if best_log is None:
+            return None, best_value
+
+        best_assignment = []
+        for player_id, head_id, damage, worth in best_log:
+            hydra_name, head_name = engine.head_label(head_id)
+            best_assignment.append((engine.player_names[player_id], hydra_name, head_name, damage, worth))
         return best_assignment, best_value
+
+    def branch_and_bound(self, node_limit=200000, time_limit=None, target_score=None):
+        """Exact search over players in attack order.
+
+        Returns (assignment, value, gap). A gap of 0 means the value is proven
+        optimal; otherwise the node or time limit was hit, or the value reached
+        target_score, and the optimum is at most value + gap.
+        """
+        started = time.monotonic()
+        deadline = started + time_limit if time_limit is not None else None
+        engine = BattleEngine(self.players, self.hydras, self.damage_matrix)
+        n_players = engine.n_players
+        worth = engine._worth
+        max_kills = engine.max_kills
+
+        # suffix_damage[k][h]: damage all players from k onward can still deal to head h,
+        # using every slot on it
+        suffix_damage = np.zeros((n_players + 1, engine.n_heads), dtype=np.int64)
+        suffix_damage[:n_players] = np.cumsum(engine.damage[::-1], axis=0)[::-1] * engine.SLOTS
+        suffix_damage = suffix_damage.tolist()
+        head_hydra = engine._head_hydra
+
+        def bound(player_id, health, kills):
+            # Optimistic: every head the remaining players could out-damage dies, and
+            # each of those kills is worth as much as the hydra's kill counter allows
+            reachable = kills[:]
+            for head_id, hp in enumerate(health):
+                if 0 < hp <= suffix_damage[player_id][head_id]:
+                    reachable[head_hydra[head_id]] += 1
+            gains = []
+            for hydra_id, killed in enumerate(kills):
+                for k in range(killed, reachable[hydra_id]):
+                    gains.append(worth[hydra_id][min(k, max_kills)])
+            gains.sort(reverse=True)
+            return sum(gains[:engine.SLOTS * (n_players - player_id)])
+
+        def children(player_id, health, kills):
+            damage_row = engine._damage_rows[player_id]
+            hittable = [head_id for head_id, hp in enumerate(health) if hp > 0 and damage_row[head_id] > 0]
+            seen = {}
+            for size in range(engine.SLOTS, 0, -1):
+                for row in combinations_with_replacement(hittable, size):
+                    child_health, child_kills = health[:], kills[:]
+                    gain = engine.play(player_id, row, child_health, child_kills)
+                    key = tuple(child_health)
+                    if key not in seen:
+                        seen[key] = (list(row), child_health, child_kills, gain)
+                if seen:
+                    break  # using fewer attacks than possible never helps
+            if not seen:
+                seen[None] = ([], health, kills, 0)
+            return list(seen.values())
+
+        start_health = engine._start_health[:]
+        start_kills = [0] * len(engine.hydra_names)
+        # A short tabu search from the greedy seed gives the first incumbent, so pruning starts
+        # from a good score. It gets at most half the time limit; at the limit it returns the greedy seed.
+        best_path = None
+        tabu_deadline = started + time_limit / 2 if time_limit is not None else None
+        incumbent, best_value = TabuSearch(engine, random.Random(0)).run(deadline=tabu_deadline)
+        for row in incumbent:
+            best_path = (row, best_path)
+        memo = {}
+        nodes = 0
+
+        # Stack entries: (player_id, health, kills, score, optimistic total, path)
+        stack = [(0, start_health, start_kills, 0, bound(0, start_health, start_kills), None)]
+        while stack:
+            if nodes >= node_limit or (deadline is not None and time.monotonic() >= deadline):
+                break
+            if target_score is not None and best_value >= target_score:
+                break
+
+            player_id, health, kills, score, optimistic, path = stack.pop()
+            if optimistic <= best_value:
+                continue
+            if player_id == n_players:
+                if score > best_value:
+                    best_value, best_path = score, path
+                continue
+
+            key = (player_id, tuple(health), tuple(kills))
+            if memo.get(key, -1) >= score:
+                continue  # same battle state already reached with at least this score
+            memo[key] = score
+            nodes += 1
+
+            expanded = []
+            for row, child_health, child_kills, gain in children(player_id, health, kills):
+                child_score = score + gain
+                child_optimistic = child_score + bound(player_id + 1, child_health, child_kills)
+                if child_optimistic > best_value:
+                    expanded.append((player_id + 1, child_health, child_kills, child_score,
+                                     child_optimistic, (row, path)))
+            # Most promising child on top of the stack
+            expanded.sort(key=lambda node: (node[4], node[3]))
+            stack.extend(expanded)
+
+        # Nodes still on the stack were never explored
+        upper = max([best_value] + [node[4] for node in stack])
+        upper = min(upper, max(best_value, engine.upper_bound()))
+
+        targets = [[-1] * engine.SLOTS for _ in range(n_players)]
+        player_id = n_players - 1
+        while best_path is not None:
+            row, best_path = best_path
+            targets[player_id][:len(row)] = row
+            player_id -= 1
+
+        return engine.decode(targets), best_value, upper - best_value
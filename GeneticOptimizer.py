@@ -0,0 +1,93 @@
+import random
+
+import numpy as np
+
+from BatchEvaluator import BatchEvaluator
+
+
+class GeneticOptimizer:
+    """Evolutionary search over whole populations of integer assignments.
+
+    Each generation is scored in one BatchEvaluator pass. Parents are picked
+    by tournament, children take every player's attack triple from one
+    parent or the other (uniform crossover on triples), single slots are
+    retargeted at `mutation_rate`, and the best `elite` candidates survive
+    unchanged.
+    """
+
+    def __init__(self, engine, population_size=200, elite=4, tournament_size=3,
+                 crossover_rate=0.9, mutation_rate=0.02, rng=None):
+        self.engine = engine
+        self.evaluator = BatchEvaluator(engine)
+        self.population_size = population_size
+        self.elite = min(elite, population_size)
+        self.tournament_size = tournament_size
+        self.crossover_rate = crossover_rate
+        self.mutation_rate = mutation_rate
+        self.rng = rng if rng is not None else np.random.default_rng(random.getrandbits(64))
+
+        # Same target distribution as Annealer.random_target: a random living hydra, then one of its heads
+        hydra_heads = {}
+        for head_id, (hydra_id, health) in enumerate(zip(engine.head_hydra.tolist(), engine.start_health.tolist())):
+            if health > 0:
+                hydra_heads.setdefault(hydra_id, []).append(head_id)
+        self.target_heads = np.array([h for heads in hydra_heads.values() for h in heads], dtype=np.int64)
+        self.target_weights = np.array([1.0 / (len(hydra_heads) * len(heads))
+                                        for heads in hydra_heads.values() for _ in heads])
+
+    def random_heads(self, size):
+        if len(self.target_heads) == 0:
+            return np.full(size, -1, dtype=np.int64)
+        return self.rng.choice(self.target_heads, size=size, p=self.target_weights)
+
+    def random_population(self, n):
+        return self.random_heads((n, self.engine.n_players, self.engine.SLOTS))
+
+    def select(self, population, scores):
+        entrants = self.rng.integers(len(population), size=(len(population), self.tournament_size))
+        winners = entrants[np.arange(len(population)), np.argmax(scores[entrants], axis=1)]
+        return population[winners]
+
+    def crossover(self, parents):
+        mothers = parents
+        fathers = parents[self.rng.permutation(len(parents))]
+        from_father = self.rng.random(parents.shape[:2]) < 0.5
+        from_father &= (self.rng.random(len(parents)) < self.crossover_rate)[:, None]
+        return np.where(from_father[:, :, None], fathers, mothers)
+
+    def mutate(self, population):
+        mask = self.rng.random(population.shape) < self.mutation_rate
+        population[mask] = self.random_heads(int(mask.sum()))
+        return population
+
+    def run(self, generations=300, patience=60, initial=None, target_score=None):
+        # target_score: stop as soon as the best score reaches it, e.g. the upper bound minus a gap
+        population = self.random_population(self.population_size)
+        if initial is not None:
+            population[0] = initial
+        scores = self.evaluator.evaluate(population)
+
+        best = int(np.argmax(scores))
+        best_targets, best_score = population[best].copy(), int(scores[best])
+        no_improve_counter = 0
+
+        for _ in range(generations):
+            if target_score is not None and best_score >= target_score:
+                break
+            elite = population[np.argsort(scores)[::-1][:self.elite]]
+            children = self.mutate(self.crossover(self.select(population, scores)))
+            children[:self.elite] = elite
+
+            population = children
+            scores = self.evaluator.evaluate(population)
+
+            best = int(np.argmax(scores))
+            if scores[best] > best_score:
+                best_targets, best_score = population[best].copy(), int(scores[best])
+                no_improve_counter = 0
+            else:
+                no_improve_counter += 1
+                if no_improve_counter > patience:
+                    break
+
+        return best_targets, best_score
@@ -0,0 +1,65 @@
+import random
+
+
+class GreedyBuilder:
+    """Constructive start for the optimizers.
+
+    Repeatedly plans the kill with the best worth per attack: for every head
+    still standing, the players with free slots are taken in descending
+    damage order until the head's health is covered, and the head whose
+    current worth divided by the number of attacks spent is highest wins.
+    With `randomness` > 0 every ratio is scaled down by a random factor of up
+    to that fraction, which gives varied but still sensible starts.
+    """
+
+    def __init__(self, engine, rng=None):
+        self.engine = engine
+        self.rng = rng if rng is not None else random.Random(random.getrandbits(64))
+
+    def plan_kill(self, head_id, health, free_slots):
+        # Fewest attacks (strongest players first) that cover the head's health, or None
+        damage_rows = self.engine._damage_rows
+        candidates = sorted((player_id for player_id, slots in enumerate(free_slots)
+                             if slots and damage_rows[player_id][head_id] > 0),
+                            key=lambda player_id: damage_rows[player_id][head_id], reverse=True)
+        attackers, dealt = [], 0
+        for player_id in candidates:
+            attackers.append(player_id)
+            dealt += damage_rows[player_id][head_id]
+            if dealt >= health:
+                return attackers
+        return None
+
+    def build(self, randomness=0.0):
+        engine = self.engine
+        worth = engine._worth
+        head_hydra = engine._head_hydra
+        targets = [[-1] * engine.SLOTS for _ in range(engine.n_players)]
+        free_slots = [engine.SLOTS] * engine.n_players
+        kills = [0] * len(engine.hydra_names)
+        standing = [head_id for head_id, hp in enumerate(engine._start_health) if hp > 0]
+
+        while standing:
+            options = []
+            for head_id in standing:
+                attackers = self.plan_kill(head_id, engine._start_health[head_id], free_slots)
+                if attackers is None:
+                    continue
+                hydra_id = head_hydra[head_id]
+                head_worth = worth[hydra_id][min(kills[hydra_id], engine.max_kills)]
+                ratio = head_worth / len(attackers)
+                if randomness > 0:
+                    ratio *= 1.0 - randomness * self.rng.random()
+                options.append((ratio, head_id, attackers))
+            if not options:
+                break
+
+            _, head_id, attackers = max(options)
+
+            for player_id in attackers:
+                targets[player_id][engine.SLOTS - free_slots[player_id]] = head_id
+                free_slots[player_id] -= 1
+            kills[head_hydra[head_id]] += 1
+            standing.remove(head_id)
+
+        return targets
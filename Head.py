@@ -1,11 +1,14 @@
 from HydraValues import HydraValues
 
 class Head:
+    __slots__ = ("parent", "name", "startHealth", "health", "index", "worthCounter", "alive", "worth")
+
     def __init__(self, name, hydra, health=1000000):  # allow passing health
         self.parent = hydra
         self.name = name
         self.startHealth = health
         self.health = health
+        self.index = 0  # column in HydraSimulator.damage_matrix
         self.worthCounter = 0
         self.alive = True
         self.worth = HydraValues.getHydraIndex(hydra.name, self.worthCounter)
@@ -1,4 +1,6 @@
 class Hydra:
+    __slots__ = ("name", "heads")
+
     def __init__(self, name, heads):
         self.name = name        # str
         self.heads = heads      # List[Head]
@@ -0,0 +1,97 @@
+class IncrementalEvaluator:
+    """Keeps per-player checkpoints of the battle state so small edits rescore cheaply.
+
+    states[k] is the (health, kills) state before player k attacks and
+    gains[k] the worth player k collects. Changing slots of player k only
+    replays players k onward, and stops as soon as the replayed state matches
+    the old checkpoint again, since every later player then plays out the same.
+    """
+
+    def __init__(self, engine, targets):
+        self.engine = engine
+        self.steps = 0  # players replayed, to measure work per evaluation
+        self._undo = None
+        self.reset(targets)
+
+    def reset(self, targets):
+        engine = self.engine
+        self.targets = [list(row) for row in targets]
+        self.states = [None] * (engine.n_players + 1)
+        self.gains = [0] * engine.n_players
+
+        health = engine._start_health[:]
+        kills = [0] * len(engine.hydra_names)
+        for player_id, row in enumerate(self.targets):
+            self.states[player_id] = (health[:], kills[:])
+            self.gains[player_id] = engine.play(player_id, row, health, kills)
+        self.states[engine.n_players] = (health, kills)
+        self.steps += engine.n_players
+
+        self.score = sum(self.gains)
+        self._undo = None
+        return self.score
+
+    def apply(self, changes):
+        # changes: [(player_id, slot, head_id), ...]; returns the new score
+        old_targets = []
+        for player_id, slot, head_id in changes:
+            old_targets.append((player_id, slot, self.targets[player_id][slot]))
+            self.targets[player_id][slot] = head_id
+
+        first = min(change[0] for change in changes)
+        last = max(change[0] for change in changes)
+        health, kills = self.states[first]
+        health, kills = health[:], kills[:]
+
+        replaced = []
+        old_score = self.score
+        for player_id in range(first, self.engine.n_players):
+            gain = self.engine.play(player_id, self.targets[player_id], health, kills)
+            self.steps += 1
+            replaced.append((player_id, self.gains[player_id], self.states[player_id + 1]))
+            self.score += gain - self.gains[player_id]
+            self.gains[player_id] = gain
+
+            old_health, old_kills = self.states[player_id + 1]
+            if player_id >= last and health == old_health and kills == old_kills:
+                break  # converged, the rest of the checkpoints still hold
+            self.states[player_id + 1] = (health[:], kills[:])
+
+        self._undo = (old_targets, replaced, old_score)
+        return self.score
+
+    def peek(self, player_id, slot, head_id):
+        # (score, final health) with one slot retargeted, leaving targets and checkpoints
+        # untouched. The health is None when the replay converged, i.e. it did not change.
+        engine = self.engine
+        row = self.targets[player_id][:]
+        row[slot] = head_id
+        health, kills = self.states[player_id]
+        health, kills = health[:], kills[:]
+
+        score = self.score + engine.play(player_id, row, health, kills) - self.gains[player_id]
+        self.steps += 1
+        for next_id in range(player_id + 1, engine.n_players):
+            old_health, old_kills = self.states[next_id]
+            if health == old_health and kills == old_kills:
+                return score, None
+            score += engine.play(next_id, self.targets[next_id], health, kills) - self.gains[next_id]
+            self.steps += 1
+        old_health, old_kills = self.states[engine.n_players]
+        if health == old_health and kills == old_kills:
+            return score, None
+        return score, health
+
+    def reject(self):
+        # Roll back the last apply()
+        old_targets, replaced, old_score = self._undo
+        for player_id, slot, head_id in reversed(old_targets):
+            self.targets[player_id][slot] = head_id
+        for player_id, gain, state in replaced:
+            self.gains[player_id] = gain
+            self.states[player_id + 1] = state
+        self.score = old_score
+        self._undo = None
+
+    def accept(self):
+        self._undo = None
@@ -0,0 +1,63 @@
+class MoveIndex:
+    """Per-player list of the heads a player can actually damage.
+
+    Built once from a BattleEngine so mutation operators never propose a
+    target the player deals 0 damage to. With `weighted` the heads are drawn
+    proportionally to damage / start health (capped at 1, a one-hit kill),
+    using Walker alias tables so every draw is O(1). With `players`, only
+    those players are ever moved, e.g. the ones a sheet edit affected.
+    """
+
+    def __init__(self, engine, weighted=False, players=None):
+        self.engine = engine
+        self.weighted = weighted
+        start_health = engine.start_health.tolist()
+
+        self.heads = []
+        self.alias = []
+        for damage_row in engine._damage_rows:
+            heads = [head_id for head_id, damage in enumerate(damage_row)
+                     if damage > 0 and start_health[head_id] > 0]
+            self.heads.append(heads)
+            if weighted and heads:
+                weights = [min(damage_row[head_id] / start_health[head_id], 1.0) for head_id in heads]
+                self.alias.append(self._alias_table(weights))
+            else:
+                self.alias.append(None)
+
+        # Players with at least one useful target
+        allowed = set(range(engine.n_players)) if players is None else set(players)
+        self.players = [player_id for player_id, heads in enumerate(self.heads) if heads and player_id in allowed]
+
+    @staticmethod
+    def _alias_table(weights):
+        n = len(weights)
+        total = sum(weights)
+        scaled = [weight * n / total for weight in weights]
+        probability = [1.0] * n
+        alias = list(range(n))
+
+        small = [i for i, weight in enumerate(scaled) if weight < 1.0]
+        large = [i for i, weight in enumerate(scaled) if weight >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            probability[low] = scaled[low]
+            alias[low] = high
+            scaled[high] += scaled[low] - 1.0
+            (small if scaled[high] < 1.0 else large).append(high)
+        return probability, alias
+
+    def can_damage(self, player_id, head_id):
+        return head_id < 0 or self.engine._damage_rows[player_id][head_id] > 0
+
+    def sample(self, player_id, rng):
+        # A head the player can damage, or -1 if there is none
+        heads = self.heads[player_id]
+        if not heads:
+            return -1
+        i = int(rng.random() * len(heads))
+        table = self.alias[player_id]
+        if table is None:
+            return heads[i]
+        probability, alias = table
+        return heads[i] if rng.random() < probability[i] else heads[alias[i]]
@@ -0,0 +1,295 @@
+"""Resident optimizer: keeps sheets and a worker pool warm between jobs.
+
+Start it once per Hydra cycle and send it JSON lines, over stdin/stdout
+(default) or a Unix socket:
+
+    python OptimizerService.py
+    python OptimizerService.py --socket /tmp/hydra.sock
+
+Requests, each with an optional "id" echoed on every reply:
+    {"id": 1, "op": "load", "sheet": "sheet.csv"}
+    {"id": 2, "op": "optimize", "sheet": "sheet.csv", "seconds": 10}
+    {"id": 3, "op": "score", "sheet": "sheet.csv", "assignment": {"player": [["Dreadful", "Fire"], ...]}}
+    {"id": 4, "op": "cancel", "job": 2}
+    {"op": "shutdown"}
+
+"optimize" streams {"event": "progress", "best_score": ...} on every
+improvement and ends with {"event": "done", "score": ..., "assignment": ...}.
+"cancel" stops the running chains of every job the same client started
+with that id; each job's "done" reply has
+"cancelled": true and leaves out score and assignment if no chain had
+finished. A malformed request only gets an {"event": "error"} reply.
+Sheets are parsed on first use and again only when the file changes.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from main import HydraSimulator, available_workers, run_annealing_for
+
+
+class OptimizerService:
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or available_workers()
+        self.pool = None
+        self.manager = None  # hands out per-job stop events the pool's workers can see
+        self.sheets = {}  # path -> (mtime, HydraSimulator)
+        # Internal job number -> (client id, the client's send, asyncio.Task). Client ids are
+        # optional and may repeat, so they are only used for replies and "cancel".
+        self.jobs = {}
+        self.job_counter = 0
+        self.stopped = None
+
+    async def start(self):
+        self.stopped = asyncio.Event()
+        self.manager = multiprocessing.Manager()
+        self.pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+        # Spawn every worker now, so the first job doesn't pay for it
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, os.getpid) for _ in range(self.max_workers)))
+
+    async def close(self):
+        # Cancelled jobs stop their chains and send their last reply before the pool goes away
+        jobs = [task for _, _, task in self.jobs.values()]
+        for task in jobs:
+            task.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+        if self.manager is not None:
+            self.manager.shutdown()
+
+    def sheet(self, path):
+        # Loaded simulator for path, reparsed only when the file changed
+        mtime = os.path.getmtime(path)
+        cached = self.sheets.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        sim = HydraSimulator(path)
+        # load_data() reports on stdout, which may be the protocol channel
+        with contextlib.redirect_stdout(sys.stderr):
+            loaded = sim.load_data()
+        if not loaded or not sim.players or not sim.hydras:
+            raise ValueError(f"not a usable Hydra sheet: {path}")
+        self.sheets[path] = (mtime, sim)
+        return sim
+
+    async def handle(self, request, send):
+        if not isinstance(request, dict):
+            await send({"event": "error", "message": "a request must be a JSON object"})
+            return
+        job_id = request.get("id")
+        op = request.get("op")
+        try:
+            if op == "load":
+                sim = self.sheet(request["sheet"])
+                await send({"id": job_id, "event": "loaded", "players": sim.engine.n_players,
+                            "heads": len(sim.engine.head_ids), "upper_bound": sim.engine.upper_bound()})
+            elif op == "score":
+                await send(self.score(job_id, request["sheet"], request["assignment"]))
+            elif op == "optimize":
+                task = asyncio.create_task(self.optimize(job_id, request["sheet"],
+                                                         float(request.get("seconds", 10)), send))
+                self.job_counter += 1
+                key = self.job_counter
+                self.jobs[key] = (job_id, send, task)
+                task.add_done_callback(lambda task: self.job_finished(key, job_id, task, send))
+            elif op == "cancel":
+                # Every running job of this client with that id
+                for client_id, client_send, task in list(self.jobs.values()):
+                    if client_id == request.get("job") and client_send is send:
+                        task.cancel()
+            elif op == "shutdown":
+                self.stopped.set()
+            else:
+                raise ValueError(f"unknown op: {op}")
+        except Exception as e:
+            # One bad request must never end the service
+            await send({"id": job_id, "event": "error", "message": f"{type(e).__name__}: {e}"})
+
+    def job_finished(self, key, job_id, task, send):
+        self.jobs.pop(key, None)
+        if task.cancelled() and not self.stopped.is_set():
+            # Cancelled before it started, so optimize() never got to reply
+            asyncio.ensure_future(send({"id": job_id, "event": "done", "cancelled": True, "evaluations": 0}))
+
+    def score(self, job_id, path, assignment):
+        if not isinstance(assignment, dict) or not all(isinstance(targets, list) for targets in assignment.values()):
+            raise ValueError('assignment must map player names to [["Hydra", "Head"], ...]')
+        sim = self.sheet(path)
+        assignment = {player: [tuple(target) for target in targets] for player, targets in assignment.items()}
+        engine = sim.engine
+        score = engine.apply_assignment(assignment)
+        heads_killed = sum(1 for head_id in engine.head_ids.values() if engine.health[head_id] <= 0)
+        return {"id": job_id, "event": "result", "score": score, "upper_bound": engine.upper_bound(),
+                "heads_killed": heads_killed, "total_heads": len(engine.head_ids)}
+
+    async def optimize(self, job_id, path, seconds, send):
+        # Keeps one chain per worker running until the time is up, reporting every improvement
+        try:
+            sim = self.sheet(path)
+        except (ValueError, OSError) as e:
+            await send({"id": job_id, "event": "error", "message": str(e)})
+            return
+
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        deadline = started + seconds
+        stop = self.manager.Event()
+        # Re-read per job, so a tuning run between jobs takes effect; warnings stay off the protocol channel
+        with contextlib.redirect_stdout(sys.stderr):
+            tuned = sim.tuned_settings()
+        best_targets, best_score, evaluations = None, -1, 0
+
+        async def collect(futures):
+            nonlocal best_targets, best_score, evaluations
+            for future in futures:
+                try:
+                    targets, score, chain_evaluations = future.result()
+                except Exception as e:
+                    await send({"id": job_id, "event": "error", "message": f"chain failed: {e}"})
+                    continue
+                evaluations += chain_evaluations
+                if score > best_score:
+                    best_targets, best_score = targets, score
+                    await send({"id": job_id, "event": "progress", "best_score": best_score,
+                                "evaluations": evaluations, "elapsed": time.monotonic() - started})
+
+        pending = set()
+        cancelled = False
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                while remaining > 0 and len(pending) < self.max_workers:
+                    pending.add(loop.run_in_executor(self.pool, run_annealing_for, remaining,
+                                                     random.getrandbits(64), sim.engine, stop, tuned))
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                await collect(done)
+        except asyncio.CancelledError:
+            cancelled = True
+        finally:
+            stop.set()
+        if pending:
+            # The job's chains see the stop event at their next check and return their best so far
+            done, _ = await asyncio.wait(pending)
+            await collect(done)
+
+        reply = {"id": job_id, "event": "done", "cancelled": cancelled, "evaluations": evaluations,
+                 "elapsed": time.monotonic() - started, "upper_bound": sim.engine.upper_bound()}
+        if best_targets is not None:
+            reply.update(score=best_score, assignment=sim.engine.decode(best_targets))
+        await send(reply)
+
+    async def serve_lines(self, read_line, send):
+        # One JSON request per line until EOF or shutdown
+        while not self.stopped.is_set():
+            line = await read_line()
+            if not line:
+                break
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                await send({"event": "error", "message": f"invalid JSON: {e}"})
+                continue
+            await self.handle(request, send)
+
+    async def serve_stdio(self):
+        loop = asyncio.get_running_loop()
+        lock = asyncio.Lock()
+
+        async def send(message):
+            async with lock:
+                sys.stdout.write(json.dumps(message) + "\n")
+                sys.stdout.flush()
+
+        try:
+            stdin = asyncio.StreamReader()
+            await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(stdin), sys.stdin)
+
+            async def read_line():
+                return (await stdin.readline()).decode()
+        except (ValueError, OSError):
+            # Regular files can't be watched by the event loop, read them from a thread
+            async def read_line():
+                return await loop.run_in_executor(None, sys.stdin.readline)
+
+        reader = asyncio.create_task(self.serve_lines(read_line, send))
+        stopped = asyncio.create_task(self.stopped.wait())
+        await asyncio.wait([reader, stopped], return_when=asyncio.FIRST_COMPLETED)
+        stopped.cancel()
+        # On EOF, let the jobs already started finish and report
+        if self.jobs and not self.stopped.is_set():
+            await asyncio.gather(*(task for _, _, task in self.jobs.values()), return_exceptions=True)
+
+    async def serve_socket(self, path):
+        async def client(reader, writer):
+            lock = asyncio.Lock()
+
+            async def send(message):
+                async with lock:
+                    if writer.is_closing():
+                        return
+                    writer.write((json.dumps(message) + "\n").encode())
+                    await writer.drain()
+
+            async def read_line():
+                return (await reader.readline()).decode()
+
+            try:
+                await self.serve_lines(read_line, send)
+            except ConnectionError:
+                pass
+            finally:
+                writer.close()
+
+        if os.path.exists(path):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(client, path=path)
+        print(f"[INFO] Listening on {path}", file=sys.stderr)
+        async with server:
+            await self.stopped.wait()
+        os.unlink(path)
+
+
+async def serve(socket_path=None, max_workers=None, preload=()):
+    service = OptimizerService(max_workers)
+    await service.start()
+    try:
+        for path in preload:
+            try:
+                service.sheet(path)
+            except (ValueError, OSError) as e:
+                print(f"[WARN] Could not preload {path}: {e}", file=sys.stderr)
+        if socket_path:
+            await service.serve_socket(socket_path)
+        else:
+            await service.serve_stdio()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resident Hydra optimizer speaking JSON lines.")
+    parser.add_argument("--socket", default=None, help="Unix socket path, stdin/stdout when omitted")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--preload", nargs="*", default=[], metavar="SHEET")
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.socket, args.workers, args.preload))
+
+
+if __name__ == "__main__":
+    main()
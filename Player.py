@@ -1,19 +1,11 @@
 class Player:
-    def __init__(self, name, maxDmgs):
+    __slots__ = ("name", "maxDmgs", "index", "attacks_left")
+
+    def __init__(self, name, maxDmgs, index=0):
         self.name = name
-        self.maxDmgs = maxDmgs
+        self.maxDmgs = maxDmgs  # row of HydraSimulator.damage_matrix, indexed by Head.index
+        self.index = index      # row in HydraSimulator.damage_matrix
         self.attacks_left = 3
 
     def DamageToHead(self, hydra, head):
-        
-        expected_column = f"{head.name} - {hydra.name}"
-        if expected_column in self.maxDmgs.columns:
-            
-            damage = self.maxDmgs[expected_column].values[0]
-            noCommaes = damage.replace(",", "")
-            #print(f"Damage to {head.parent.name} {head.name} from {self.name} is {noCommaes}")
-            return int(noCommaes)
-             
-        else:
-            print(f"Head {expected_column} NOT found in maxDmgs columns.")
-        return 0
\ No newline at end of file
+        return int(self.maxDmgs[head.index])
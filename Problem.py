@@ -0,0 +1,78 @@
+import numpy as np
+
+from HydraValues import HydraValues
+
+
+class Problem:
+    """Immutable, compact definition of one sheet's battle.
+
+    Names, the players x heads damage table, the heads' start health and
+    hydra, and the worth table; nothing that changes during a battle. Arrays
+    are read-only, damage is stored as int32 when it fits, and pickling only
+    ships these fields, so this is what pool workers should receive.
+    BattleEngine builds its mutable battle state and fast lookups from it.
+    """
+
+    __slots__ = ("player_names", "hydra_names", "head_names", "head_hydra", "start_health", "damage",
+                 "worth_table")
+
+    def __init__(self, player_names, hydra_names, head_names, head_hydra, start_health, damage, worth_table):
+        damage = np.asarray(damage, dtype=np.int64)
+        fits_int32 = damage.size == 0 or (damage.min() >= np.iinfo(np.int32).min and
+                                          damage.max() <= np.iinfo(np.int32).max)
+        fields = {
+            "player_names": tuple(player_names),
+            "hydra_names": tuple(hydra_names),
+            "head_names": tuple(head_names),  # None for columns without a head
+            "head_hydra": self._frozen(head_hydra, np.int64),
+            "start_health": self._frozen(start_health, np.int64),
+            "damage": self._frozen(damage, np.int32 if fits_int32 else np.int64),
+            "worth_table": self._frozen(worth_table, np.int64),  # [kills, hydra_id]
+        }
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    @staticmethod
+    def _frozen(values, dtype):
+        array = np.array(values, dtype=dtype)
+        array.flags.writeable = False
+        return array
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Problem is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Problem is immutable")
+
+    def __reduce__(self):
+        return (Problem, tuple(getattr(self, name) for name in self.__slots__))
+
+    @classmethod
+    def from_model(cls, players, hydras, damage_matrix):
+        # Player/Hydra/Head objects plus the sheet's damage matrix (columns = Head.index)
+        damage_matrix = np.asarray(damage_matrix, dtype=np.int64)
+        n_heads = damage_matrix.shape[1]
+        head_names = [None] * n_heads
+        head_hydra = np.zeros(n_heads, dtype=np.int64)
+        start_health = np.zeros(n_heads, dtype=np.int64)  # columns of missing heads keep 0 health
+        for hydra_id, hydra in enumerate(hydras):
+            for head in hydra.heads:
+                head_names[head.index] = head.name
+                head_hydra[head.index] = hydra_id
+                start_health[head.index] = head.startHealth
+
+        hydra_names = [hydra.name for hydra in hydras]
+        table = np.array(HydraValues.TableValues(), dtype=np.int64)
+        columns = [HydraValues.ListOfHydraNames().index(name) for name in hydra_names]
+
+        # Rows follow the player order, which is also the attack order
+        return cls([player.name for player in players], hydra_names, head_names, head_hydra, start_health,
+                   damage_matrix[[player.index for player in players]], table[:, columns])
+
+    @property
+    def n_players(self):
+        return len(self.player_names)
+
+    @property
+    def n_heads(self):
+        return len(self.head_names)
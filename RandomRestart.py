@@ -0,0 +1,79 @@
+import random
+
+
+class RandomRestart:
+    """Random-restart search with the same moves as Cycle.brute_force.
+
+    Every attempt shuffles the player order and sends each attack at a
+    uniformly random living head. Instead of deep-copying hydras and players,
+    one mutable state is restored from a snapshot before each attempt, and
+    the living heads are kept in a swap-remove list so picking and removing a
+    target is O(1).
+    """
+
+    def __init__(self, engine, rng=None):
+        self.engine = engine
+        self.rng = rng if rng is not None else random.Random(random.getrandbits(64))
+
+        # Snapshot of the starting state
+        self._start_health = engine.start_health.tolist()
+        self._start_live = [head_id for head_id, hp in enumerate(self._start_health) if hp > 0]
+
+    def run(self, max_attempts=10000, target_score=None):
+        # Returns ([(player_id, head_id, damage, worth), ...], value) of the best attempt,
+        # stopping early once the value reaches target_score
+        engine = self.engine
+        rng = self.rng
+        damage_rows = engine._damage_rows
+        head_hydra = engine._head_hydra
+        worth = engine._worth
+        max_kills = engine.max_kills
+        n_hydras = len(engine.hydra_names)
+        start_position = [0] * engine.n_heads
+        for position, head_id in enumerate(self._start_live):
+            start_position[head_id] = position
+
+        order = list(range(engine.n_players))
+        health = self._start_health[:]
+        best_log, best_value = None, 0
+
+        for _ in range(max_attempts):
+            # Restore the snapshot
+            health[:] = self._start_health
+            live = self._start_live[:]
+            position = start_position[:]
+            kills = [0] * n_hydras
+            rng.shuffle(order)
+
+            total_value = 0
+            attack_log = []
+            for player_id in order:
+                damage_row = damage_rows[player_id]
+                for _ in range(engine.SLOTS):
+                    if not live:
+                        break
+                    head_id = live[rng.randrange(len(live))]
+                    hydra_id = head_hydra[head_id]
+                    killed = kills[hydra_id]
+                    head_worth = worth[hydra_id][killed if killed < max_kills else max_kills]
+
+                    damage = damage_row[head_id]
+                    health[head_id] -= damage
+                    if health[head_id] <= 0:
+                        # Swap-remove from the living heads
+                        last = live.pop()
+                        if last != head_id:
+                            live[position[head_id]] = last
+                            position[last] = position[head_id]
+                        kills[hydra_id] = killed + 1
+                        total_value += head_worth
+
+                    attack_log.append((player_id, head_id, damage, head_worth))
+
+            if total_value > best_value:
+                best_value = total_value
+                best_log = attack_log
+                if target_score is not None and best_value >= target_score:
+                    break
+
+        return best_log, best_value
@@ -0,0 +1,86 @@
+import numpy as np
+
+
+class RobustIncrementalEvaluator:
+    """IncrementalEvaluator for a RobustnessEvaluator's objective.
+
+    Same interface (targets, score, steps, apply/reject/accept), but every
+    checkpoint holds the battle state of all damage samples and `score` is
+    the expected or quantile score. A change replays from the first changed
+    player until the states of every sample match the old checkpoint again.
+    The checkpoints grow with players x samples, see
+    RobustnessEvaluator.check_memory().
+    """
+
+    def __init__(self, robustness, targets):
+        self.robustness = robustness
+        self.engine = robustness.engine
+        self.steps = 0  # players replayed, to measure work per evaluation
+        self._undo = None
+        self.reset(targets)
+
+    def reset(self, targets):
+        robustness = self.robustness
+        n_players = self.engine.n_players
+        self.targets = [list(row) for row in targets]
+        self.states = [None] * (n_players + 1)
+        self.gains = [None] * n_players
+
+        health, kills = robustness.start_state()
+        for player_id, row in enumerate(self.targets):
+            self.states[player_id] = (health.copy(), kills.copy())
+            self.gains[player_id] = robustness.play(player_id, row, health, kills)
+        self.states[n_players] = (health, kills)
+        self.steps += n_players
+
+        self.sample_scores = np.sum(self.gains, axis=0) if self.gains else np.zeros(robustness.n_samples, np.int64)
+        self.score = robustness.summarize(self.sample_scores)
+        self._undo = None
+        return self.score
+
+    def apply(self, changes):
+        # changes: [(player_id, slot, head_id), ...]; returns the new score
+        old_targets = []
+        for player_id, slot, head_id in changes:
+            old_targets.append((player_id, slot, self.targets[player_id][slot]))
+            self.targets[player_id][slot] = head_id
+
+        first = min(change[0] for change in changes)
+        last = max(change[0] for change in changes)
+        health, kills = self.states[first]
+        health, kills = health.copy(), kills.copy()
+
+        replaced = []
+        old_sample_scores, old_score = self.sample_scores, self.score
+        sample_scores = self.sample_scores.copy()
+        for player_id in range(first, self.engine.n_players):
+            gain = self.robustness.play(player_id, self.targets[player_id], health, kills)
+            self.steps += 1
+            replaced.append((player_id, self.gains[player_id], self.states[player_id + 1]))
+            sample_scores += gain - self.gains[player_id]
+            self.gains[player_id] = gain
+
+            old_health, old_kills = self.states[player_id + 1]
+            if player_id >= last and np.array_equal(health, old_health) and np.array_equal(kills, old_kills):
+                break  # converged in every sample
+            self.states[player_id + 1] = (health.copy(), kills.copy())
+
+        self.sample_scores = sample_scores
+        self.score = self.robustness.summarize(sample_scores)
+        self._undo = (old_targets, replaced, old_sample_scores, old_score)
+        return self.score
+
+    def reject(self):
+        # Roll back the last apply()
+        old_targets, replaced, old_sample_scores, old_score = self._undo
+        for player_id, slot, head_id in reversed(old_targets):
+            self.targets[player_id][slot] = head_id
+        for player_id, gain, state in replaced:
+            self.gains[player_id] = gain
+            self.states[player_id + 1] = state
+        self.sample_scores = old_sample_scores
+        self.score = old_score
+        self._undo = None
+
+    def accept(self):
+        self._undo = None
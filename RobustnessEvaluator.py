@@ -0,0 +1,129 @@
+import numpy as np
+
+from RobustIncrementalEvaluator import RobustIncrementalEvaluator
+
+
+class RobustnessEvaluator:
+    """Scores one assignment under many sampled damage rolls at once.
+
+    The sheet holds max hits, so every attack deals its damage times a
+    factor drawn uniformly from [1 - spread, 1]. The factors are drawn once
+    per (sample, player, slot) and reused for every assignment, so two
+    assignments are always compared on the same rolls. All samples walk the
+    attack order in lockstep: each attack is a handful of NumPy operations
+    over an (n_samples, heads) health array.
+
+    objective is "expected" (mean score) or "quantile" (the `quantile`
+    score, e.g. 0.1 = what 90% of the rolls reach). Pass an instance as
+    Annealer.run(objective=...) to optimize it instead of the max-hit score.
+    That keeps the battle state of every sample after every player, about
+    players x samples x (heads + hydras) x 8 bytes (400 MB for 2000 players
+    and 1000 samples), so incremental() refuses to go beyond
+    MAX_CHECKPOINT_BYTES; max_samples() tells how many samples fit.
+    """
+
+    MAX_CHECKPOINT_BYTES = 256 * 2 ** 20
+
+    def __init__(self, engine, n_samples=1000, spread=0.1, objective="expected", quantile=0.1, seed=0):
+        if objective not in ("expected", "quantile"):
+            raise ValueError(f"Unknown objective: {objective}")
+        self.engine = engine
+        self.n_samples = n_samples
+        self.spread = spread
+        self.objective = objective
+        self.quantile = quantile
+
+        rng = np.random.default_rng(seed)
+        self.factors = rng.uniform(1.0 - spread, 1.0, size=(engine.n_players, engine.SLOTS, n_samples))
+        self.damage = engine.damage
+        self.worth_table = engine.worth_table
+        self.max_kills = engine.max_kills
+        self._head_hydra = engine._head_hydra
+        self._damage_rows = engine._damage_rows
+
+    def start_state(self):
+        health = np.tile(self.engine.start_health, (self.n_samples, 1))
+        kills = np.zeros((self.n_samples, len(self.engine.hydra_names)), dtype=np.int64)
+        return health, kills
+
+    def play(self, player_id, row, health, kills):
+        # One player's attacks in every sample, in place; returns the (n_samples,) worth gained
+        gains = np.zeros(self.n_samples, dtype=np.int64)
+        damage_row = self._damage_rows[player_id]
+        for slot, head_id in enumerate(row):
+            if head_id < 0 or damage_row[head_id] <= 0:
+                continue
+            hp = health[:, head_id]
+            alive = hp > 0
+            if not alive.any():
+                continue
+
+            damage = (damage_row[head_id] * self.factors[player_id, slot]).astype(np.int64)
+            new_hp = np.where(alive, np.maximum(hp - damage, 0), hp)
+            health[:, head_id] = new_hp
+
+            killed = alive & (new_hp == 0)
+            if killed.any():
+                hydra_id = self._head_hydra[head_id]
+                killed_before = kills[:, hydra_id]
+                worth = self.worth_table[np.minimum(killed_before, self.max_kills), hydra_id]
+                gains += np.where(killed, worth, 0)
+                kills[:, hydra_id] = killed_before + killed
+        return gains
+
+    def simulate(self, targets):
+        # (per-sample scores, final health (n_samples, heads))
+        if isinstance(targets, np.ndarray):
+            targets = targets.tolist()
+        health, kills = self.start_state()
+        scores = np.zeros(self.n_samples, dtype=np.int64)
+        for player_id, row in enumerate(targets):
+            scores += self.play(player_id, row, health, kills)
+        return scores, health
+
+    def summarize(self, sample_scores):
+        # Objective value of a vector of per-sample scores
+        if self.objective == "quantile":
+            return float(np.quantile(sample_scores, self.quantile))
+        return float(sample_scores.mean())
+
+    def score(self, targets):
+        return self.summarize(self.simulate(targets)[0])
+
+    def kill_probability(self, health):
+        # Share of samples in which each head dies, NaN for columns without a head
+        probability = (health <= 0).mean(axis=0)
+        probability[self.engine.start_health <= 0] = np.nan
+        return probability
+
+    def checkpoint_bytes(self, n_samples=None):
+        # Memory of the per-player battle states incremental() keeps: health and kills of every sample
+        n_samples = self.n_samples if n_samples is None else n_samples
+        engine = self.engine
+        return (engine.n_players + 1) * n_samples * (engine.n_heads + len(engine.hydra_names)) * 8
+
+    def max_samples(self):
+        return self.MAX_CHECKPOINT_BYTES // max(self.checkpoint_bytes(1), 1)
+
+    def check_memory(self):
+        if self.checkpoint_bytes() > self.MAX_CHECKPOINT_BYTES:
+            raise ValueError(f"{self.n_samples} damage samples need {self.checkpoint_bytes() / 2 ** 20:,.0f} MB of "
+                             f"checkpoints for {self.engine.n_players} players, use at most {self.max_samples()}")
+
+    def incremental(self, targets):
+        self.check_memory()
+        return RobustIncrementalEvaluator(self, targets)
+
+    def print_report(self, targets, deterministic_score=None):
+        scores, health = self.simulate(targets)
+        probability = self.kill_probability(health)
+
+        print(f"\n[ROBUSTNESS] {self.n_samples} damage rolls, hits between {1 - self.spread:.0%} and 100% of max")
+        if deterministic_score is not None:
+            print(f"  {'max-hit score':<20} {deterministic_score:>12,}")
+        print(f"  {'expected score':<20} {scores.mean():>12,.1f}")
+        print(f"  {'10% quantile':<20} {np.quantile(scores, 0.1):>12,.1f}")
+        print(f"  {'worst roll':<20} {scores.min():>12,}")
+        for (hydra_name, head_name), head_id in self.engine.head_ids.items():
+            if 0 < probability[head_id] < 1:
+                print(f"  {head_name + ' - ' + hydra_name:<20} {probability[head_id]:>12.1%} kill chance")
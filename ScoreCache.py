@@ -0,0 +1,70 @@
+import random
+import sys
+from collections import OrderedDict
+
+
+class ScoreCache:
+    """Bounded LRU cache of assignment scores for one BattleEngine.
+
+    Assignments are keyed by a 64-bit Zobrist hash: one random number per
+    (player, slot, head), XOR-ed together. Retargeting a slot updates the key
+    in O(1) with rekey(), so the annealing loop never has to build a tuple of
+    every slot per move. The random table is seeded, so every chain in a
+    worker that uses the same cache agrees on the keys.
+    """
+
+    def __init__(self, engine, max_entries=100000, seed=0):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._scores = OrderedDict()
+
+        # _keys[player][slot][head_id + 1], index 0 is the empty slot (-1)
+        rng = random.Random(seed)
+        self._keys = [[[rng.getrandbits(64) for _ in range(engine.n_heads + 1)]
+                       for _ in range(engine.SLOTS)]
+                      for _ in range(engine.n_players)]
+
+    def key(self, targets):
+        key = 0
+        for player_keys, row in zip(self._keys, targets):
+            for slot_keys, head_id in zip(player_keys, row):
+                key ^= slot_keys[head_id + 1]
+        return key
+
+    def rekey(self, key, targets, changes):
+        # Key of `targets` after applying changes [(player_id, slot, head_id), ...]
+        pending = {}
+        for player_id, slot, head_id in changes:
+            old = pending.get((player_id, slot), targets[player_id][slot])
+            slot_keys = self._keys[player_id][slot]
+            key ^= slot_keys[old + 1] ^ slot_keys[head_id + 1]
+            pending[(player_id, slot)] = head_id
+        return key
+
+    def get(self, key):
+        score = self._scores.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._scores.move_to_end(key)
+        return score
+
+    def put(self, key, score):
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        if len(self._scores) > self.max_entries:
+            self._scores.popitem(last=False)
+
+    def __len__(self):
+        return len(self._scores)
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def memory_bytes(self):
+        # The dict itself plus its int keys and scores; the Zobrist table is fixed overhead
+        return sys.getsizeof(self._scores) + sum(sys.getsizeof(k) + sys.getsizeof(v)
+                                                  for k, v in self._scores.items())
@@ -0,0 +1,58 @@
+class SheetDiff:
+    """What changed between two loads of a guild sheet.
+
+    Players are matched by name and heads by their (hydra, head) label, so
+    reordered rows or columns are not changes. Built from two BattleEngines:
+        added_players     names only in the new sheet
+        removed_players   names only in the old sheet
+        changed_players   {name: [(hydra, head), ...]} whose damage changed
+        changed_heads     labels whose health changed, or that were added or removed
+    """
+
+    def __init__(self, old_engine, new_engine):
+        old_players = {name: player_id for player_id, name in enumerate(old_engine.player_names)}
+        new_players = {name: player_id for player_id, name in enumerate(new_engine.player_names)}
+        self.added_players = [name for name in new_engine.player_names if name not in old_players]
+        self.removed_players = [name for name in old_engine.player_names if name not in new_players]
+
+        old_heads, new_heads = old_engine.head_ids, new_engine.head_ids
+        self.changed_heads = sorted(set(old_heads) ^ set(new_heads))
+        self.changed_heads += [label for label in new_heads if label in old_heads and
+                               old_engine._start_health[old_heads[label]] != new_engine._start_health[new_heads[label]]]
+
+        self.changed_players = {}
+        for name, new_id in new_players.items():
+            old_id = old_players.get(name)
+            if old_id is None:
+                continue
+            old_row, new_row = old_engine._damage_rows[old_id], new_engine._damage_rows[new_id]
+            changed = [label for label, head_id in new_heads.items()
+                       if label in old_heads and old_row[old_heads[label]] != new_row[head_id]]
+            if changed:
+                self.changed_players[name] = changed
+
+    def is_empty(self):
+        return not (self.added_players or self.removed_players or self.changed_players or self.changed_heads)
+
+    def affected_players(self, new_engine, assignment):
+        """Player ids in new_engine whose attacks may need to change.
+
+        New players, players whose damage changed, and players whose current
+        targets in `assignment` are changed heads.
+        """
+        names = set(self.added_players) | set(self.changed_players)
+        changed_heads = set(self.changed_heads)
+        for name, targets in assignment.items():
+            if any(tuple(target) in changed_heads for target in targets):
+                names.add(name)
+        return [player_id for player_id, name in enumerate(new_engine.player_names) if name in names]
+
+    def print_summary(self):
+        print(f"[INFO] Sheet changes: {len(self.added_players)} new, {len(self.removed_players)} removed, "
+              f"{len(self.changed_players)} changed players, {len(self.changed_heads)} changed heads")
+        for name in self.added_players:
+            print(f"  + {name}")
+        for name in self.removed_players:
+            print(f"  - {name}")
+        for name, labels in self.changed_players.items():
+            print(f"  ~ {name}: " + ", ".join(f"{head} - {hydra}" for hydra, head in labels))
@@ -0,0 +1,58 @@
+import csv
+import random
+
+from HydraValues import HydraValues
+
+
+class SheetGenerator:
+    """Writes synthetic guild sheets in the HydraHelperSheet format.
+
+    Header `Name,<Head> - <Hydra>,...`, one row of max damages per player and
+    a last row with the heads' health, numbers quoted with thousands
+    separators like the exported sheets. Head health grows with the guild
+    size, so every sheet size stays a comparable fight.
+    """
+
+    HEAD_NAMES = ["Darkness", "Water", "Earth", "Light", "Wind", "Fire"]
+
+    # Head health of each hydra on the 30-player Brasil sheet
+    BASE_HEALTH = {
+        "Common": 5946906,
+        "Elder": 17699730,
+        "Ancient": 54533157,
+        "Dreadful": 106981939,
+    }
+    BASE_PLAYERS = 30
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def columns(self):
+        hydras = list(reversed(HydraValues.ListOfHydraNames()))  # Dreadful first, as in the sheets
+        return [(head, hydra) for hydra in hydras for head in self.HEAD_NAMES]
+
+    def write(self, path, n_players, sparsity=0.5):
+        # sparsity: share of damage cells that are 0 (heads the player cannot hit)
+        columns = self.columns()
+        scale = max(n_players / self.BASE_PLAYERS, 0.1)
+        health = {hydra: int(base * scale) for hydra, base in self.BASE_HEALTH.items()}
+
+        with open(path, mode='w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["Name"] + [f"{head} - {hydra}" for head, hydra in columns])
+
+            for player in range(n_players):
+                # Account strength, a few whales and a long tail like a real guild
+                power = min(self.rng.lognormvariate(-2.0, 0.8), 1.2)
+                row = [f"Player{player:04d}"]
+                for head, hydra in columns:
+                    if self.rng.random() < sparsity:
+                        row.append("0")
+                    else:
+                        damage = int(self.BASE_HEALTH[hydra] * power * self.rng.uniform(0.5, 1.5))
+                        row.append(f"{damage:,}")
+                writer.writerow(row)
+
+            writer.writerow([""] + [f"{health[hydra]:,}" for _, hydra in columns])
+
+        return path
@@ -0,0 +1,115 @@
+import csv
+from array import array
+
+import numpy as np
+
+from HydraValues import HydraValues
+
+
+def parse_number(value):
+    # Sheet cells are exported with thousands separators, e.g. "60,295,650"
+    return int(str(value).replace(",", ""))
+
+
+class SheetLoader:
+    """Single-pass reader for HydraHelperSheet CSV exports, without pandas.
+
+    Every row is parsed with the csv module straight into one flat int64
+    buffer as it streams by. The last row holds the heads' health. Headers
+    are checked against HydraValues.hydraNames, and every malformed cell is
+    collected and reported once at the end instead of failing on the first.
+    After load():
+        names         player names, in sheet order
+        columns       every target header after "Name", in sheet order
+        heads         [(column, head_name, hydra_name, health), ...] for usable columns
+        damage        int64 array (players x heads), columns follow `heads`
+        errors        [(row_number, name, column, value), ...] of unparsable cells
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.names = []
+        self.columns = []
+        self.heads = []
+        self.damage = np.zeros((0, 0), dtype=np.int64)
+        self.errors = []
+
+    def load(self):
+        try:
+            with open(self.path, newline='', encoding='utf-8-sig') as csvfile:
+                return self._parse(csv.reader(csvfile))
+        except OSError as e:
+            print(f"[ERROR] Failed to read CSV file: {e}")
+            return False
+
+    def _parse(self, reader):
+        header = next(reader, None)
+        if not header or len(header) < 2:
+            print("[ERROR] CSV file has no target columns.")
+            return False
+        self.columns = header[1:]
+        n_columns = len(self.columns)
+
+        # Header checks: "<Head> - <Hydra>" with a known hydra name
+        usable = []
+        for column_index, column in enumerate(self.columns):
+            try:
+                head_name, hydra_name = column.split(" - ")
+            except ValueError:
+                print(f"[WARN] Skipping malformed column header: {column}")
+                continue
+            if hydra_name not in HydraValues.ListOfHydraNames():
+                print(f"[WARN] Skipping column with unknown hydra '{hydra_name}': {column}")
+                continue
+            usable.append((column_index, column, head_name, hydra_name))
+
+        # Only usable columns are parsed; skipped headers were already reported
+        usable_indices = [column_index + 1 for column_index, _, _, _ in usable]
+        cells = array('q')
+        names = []
+        bad_cells = []  # (row_number, row_index, position in usable, value)
+        for row_number, row in enumerate(reader, start=2):
+            if not any(cell.strip() for cell in row):
+                continue  # blank line
+            row = row + [""] * (n_columns + 1 - len(row))
+            names.append(row[0])
+            for position, cell_index in enumerate(usable_indices):
+                value = row[cell_index]
+                try:
+                    cells.append(parse_number(value))
+                except ValueError:
+                    cells.append(0)
+                    bad_cells.append((row_number, len(names) - 1, position, value))
+
+        if not names:
+            print("[ERROR] CSV file has no health row.")
+            return False
+
+        table = np.frombuffer(cells, dtype=np.int64).reshape(len(names), len(usable))
+        health_row = len(names) - 1
+
+        # Heads whose health cell is unusable are dropped, like malformed headers
+        bad_health = {position for _, row_index, position, _ in bad_cells if row_index == health_row}
+        self.heads = []
+        keep = []
+        for position, (_, column, head_name, hydra_name) in enumerate(usable):
+            if position in bad_health:
+                continue
+            self.heads.append((column, head_name, hydra_name, int(table[health_row, position])))
+            keep.append(position)
+
+        self.names = names[:health_row]
+        self.damage = np.ascontiguousarray(table[:health_row, keep])
+        self.errors = [(row_number, names[row_index], usable[position][1], value)
+                       for row_number, row_index, position, value in bad_cells]
+        self.report_errors()
+        return True
+
+    def report_errors(self, limit=20):
+        if not self.errors:
+            return
+        print(f"[WARN] {len(self.errors)} malformed cell(s) in {self.path}, damage read as 0, heads with bad health skipped:")
+        for row_number, name, column, value in self.errors[:limit]:
+            print(f"  line {row_number} ({name or 'health row'}), '{column}': {value!r}")
+        if len(self.errors) > limit:
+            print(f"  ... and {len(self.errors) - limit} more")
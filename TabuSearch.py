@@ -0,0 +1,113 @@
+import random
+import time
+
+from Annealer import Annealer
+from IncrementalEvaluator import IncrementalEvaluator
+from MoveIndex import MoveIndex
+
+
+class TabuSearch:
+    """Tabu search over integer assignments of a BattleEngine.
+
+    Every step scans the whole single-slot neighbourhood: each slot of each
+    player retargeted to every other head the player can damage (MoveIndex).
+    Candidates are scored with IncrementalEvaluator.peek(), which replays
+    from the player's checkpoint only until the battle state converges. The
+    best move is taken even if it is worse, and moving a slot back to the
+    head it just left is tabu for `tenure` steps, unless that would beat the
+    best score found so far (aspiration).
+
+    Most moves leave the score unchanged, since only kills are worth
+    anything, so equal scores are ranked by how much health is left on the
+    heads still standing (as a share of their start health). That steers the
+    search across plateaus towards the next kill. Remaining ties are broken
+    at random.
+    """
+
+    def __init__(self, engine, rng=None, move_index=None, tenure=10):
+        self.engine = engine
+        self.rng = rng if rng is not None else random.Random(random.getrandbits(64))
+        self.moves = move_index if move_index is not None else MoveIndex(engine)
+        self.tenure = tenure
+        self.steps = 0        # players replayed by the last run()
+        self.evaluations = 0  # neighbours scored by the last run()
+        self.best_elapsed = 0.0  # seconds into the last run() when its best score was found
+
+    def remaining(self, health):
+        # Share of start health left on every head still standing, lower is closer to kills
+        start_health = self.engine._start_health
+        return sum(hp / start_health[head_id] for head_id, hp in enumerate(health) if hp > 0)
+
+    def best_move(self, evaluator, tabu_until, iteration, best_score, deadline=None):
+        # Best (score, player_id, slot, head_id) in the neighbourhood, or None. On large sheets one
+        # scan takes many seconds, so the deadline is also checked between players.
+        unchanged = -self.remaining(evaluator.states[self.engine.n_players][0])
+        best, best_moves = None, []
+        for player_id in self.moves.players:
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            row = evaluator.targets[player_id]
+            for slot in range(self.engine.SLOTS):
+                current = row[slot]
+                for head_id in self.moves.heads[player_id]:
+                    if head_id == current:
+                        continue
+                    score, health = evaluator.peek(player_id, slot, head_id)
+                    self.evaluations += 1
+                    if tabu_until.get((player_id, slot, head_id), -1) >= iteration and score <= best_score:
+                        continue  # tabu, and no aspiration
+                    rank = (score, unchanged if health is None else -self.remaining(health))
+                    if best is None or rank > best:
+                        best, best_moves = rank, [(player_id, slot, head_id)]
+                    elif rank == best:
+                        best_moves.append((player_id, slot, head_id))
+        if not best_moves:
+            return None
+        return (best[0],) + self.rng.choice(best_moves)
+
+    def run(self, max_iter=200, patience=40, initial=None, deadline=None, stop_event=None,
+            seeding="greedy", telemetry=None, target_score=None):
+        # Same (targets, score) result and stopping options as Annealer.run
+        self.evaluations = 1
+        started = time.perf_counter()
+        if initial is None:
+            initial = Annealer(self.engine, self.rng, self.moves).initial_targets(seeding)
+        evaluator = IncrementalEvaluator(self.engine, initial)
+        best_score = evaluator.score
+        best_targets = [row[:] for row in evaluator.targets]
+        self.best_elapsed = time.perf_counter() - started
+
+        tabu_until = {}  # (player_id, slot, head_id) -> last iteration the move is tabu
+        no_improve_counter = 0
+        iterations = 0
+        for i in range(max_iter):
+            if (deadline is not None and time.monotonic() >= deadline) or \
+                    (stop_event is not None and stop_event.is_set()):
+                break
+
+            move = self.best_move(evaluator, tabu_until, i, best_score, deadline)
+            if move is None:
+                break  # everything is tabu, or the deadline passed mid-scan
+            score, player_id, slot, head_id = move
+            tabu_until[(player_id, slot, evaluator.targets[player_id][slot])] = i + self.tenure
+            evaluator.apply([(player_id, slot, head_id)])
+            evaluator.accept()
+            iterations += 1
+
+            if evaluator.score > best_score:
+                best_score = evaluator.score
+                best_targets = [row[:] for row in evaluator.targets]
+                self.best_elapsed = time.perf_counter() - started
+                no_improve_counter = 0
+                if target_score is not None and best_score >= target_score:
+                    break
+            else:
+                no_improve_counter += 1
+                if no_improve_counter > patience:
+                    break
+
+        self.steps = evaluator.steps
+        if telemetry is not None:
+            telemetry.new_chain()
+            telemetry.count(evaluations=self.evaluations, tabu_iterations=iterations)
+        return best_targets, best_score
@@ -0,0 +1,113 @@
+import cProfile
+import csv
+import json
+import pstats
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+
+def span(telemetry, name):
+    # Times a block into `telemetry`, or does nothing when telemetry is None
+    return nullcontext() if telemetry is None else telemetry.span(name)
+
+
+class Telemetry:
+    """Counters, a sampled optimizer trace and timing spans for one run.
+
+    Optimizers only touch it when one is passed in, so leaving it out costs
+    nothing. The annealing trace keeps every `trace_every`-th iteration.
+    Traces from pool workers are returned with the results and folded into
+    the parent's instance with merge().
+    """
+
+    TRACE_FIELDS = ["source", "chain", "iteration", "temperature", "current_score", "best_score"]
+
+    def __init__(self, trace_every=100, profile=False, profiler=None, source="main"):
+        self.trace_every = trace_every
+        self.source = source
+        self.counters = defaultdict(int)
+        self.spans = defaultdict(float)
+        self.gauges = {}  # last reported value, e.g. a worker's cache size
+        self.trace = []
+        self.chains = 0
+        self._depth = 0  # open spans, so nested spans don't stop the profiler early
+        # Any object with enable()/disable() works, cProfile.Profile by default
+        self.profiler = profiler if profiler is not None else (cProfile.Profile() if profile else None)
+
+    def __getstate__(self):
+        # Profilers don't pickle; workers send their counters and trace only
+        state = self.__dict__.copy()
+        state["profiler"] = None
+        return state
+
+    def new_chain(self):
+        self.chains += 1
+        return self.chains - 1
+
+    def count(self, **counters):
+        for name, value in counters.items():
+            self.counters[name] += value
+
+    def gauge(self, name, value):
+        self.gauges[name] = value
+
+    def sample(self, chain, iteration, temperature, current_score, best_score):
+        self.trace.append((self.source, chain, iteration, temperature, current_score, best_score))
+
+    @contextmanager
+    def span(self, name):
+        if self.profiler is not None and self._depth == 0:
+            self.profiler.enable()
+        self._depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans[name] += time.perf_counter() - started
+            self._depth -= 1
+            if self.profiler is not None and self._depth == 0:
+                self.profiler.disable()
+
+    def merge(self, other):
+        for name, value in other.counters.items():
+            self.counters[name] += value
+        for name, value in other.spans.items():
+            self.spans[name] += value
+        self.gauges.update(other.gauges)
+        self.trace.extend(other.trace)
+        self.chains += other.chains
+
+    def write_trace_csv(self, filename):
+        with open(filename, mode='w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(self.TRACE_FIELDS)
+            writer.writerows(self.trace)
+
+    def write_json(self, filename):
+        report = {
+            "counters": dict(self.counters),
+            "spans": dict(self.spans),
+            "gauges": self.gauges,
+            "chains": self.chains,
+            "trace": [dict(zip(self.TRACE_FIELDS, row)) for row in self.trace],
+        }
+        with open(filename, mode='w', encoding='utf-8') as out:
+            json.dump(report, out, indent=2)
+
+    def write_profile(self, filename):
+        if isinstance(self.profiler, cProfile.Profile):
+            pstats.Stats(self.profiler).dump_stats(filename)
+
+    def print_summary(self):
+        print("\n[TELEMETRY]")
+        for name, value in sorted(self.counters.items()):
+            print(f"  {name:<20} {value:>12,}")
+        lookups = self.counters.get("cache_hits", 0) + self.counters.get("cache_misses", 0)
+        if lookups:
+            print(f"  {'cache hit rate':<20} {self.counters['cache_hits'] / lookups:>12.2%}")
+        for name, value in sorted(self.gauges.items()):
+            print(f"  {name:<20} {value:>12,}")
+        for name, seconds in sorted(self.spans.items()):
+            print(f"  {name + ' (s)':<20} {seconds:>12.3f}")
+        print(f"  {'trace samples':<20} {len(self.trace):>12,}")
@@ -0,0 +1,172 @@
+"""Benchmarks the engines and optimizers on synthetic guild sheets.
+
+Example:
+    python benchmark.py --players 10 100 500 2000 --sparsity 0.5 --budget 2
+
+Every (sheet size, engine) pair appends one JSON line to --output with
+evaluations/sec, best score, time to that score, peak Python memory and
+sheet load time, plus the engine's pickle size (what every pool worker
+receives) and its memory per player, tagged with the current git commit so runs can be
+compared across commits. For "parallel" the evaluations are finished
+chains and the peak memory covers the parent process only.
+"""
+import argparse
+import json
+import os
+import pickle
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from main import HydraSimulator, available_workers, run_parallel_simulations
+from Annealer import Annealer
+from Cycle import Cycle
+from SheetGenerator import SheetGenerator
+from Telemetry import Telemetry
+
+ENGINES = ["cycle", "annealing", "brute_force", "parallel"]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def peak_memory(fn):
+    # Peak bytes allocated by Python (NumPy included) while fn runs
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def load(path):
+    sim = HydraSimulator(path)
+    started = time.perf_counter()
+    if not sim.load_data():
+        raise RuntimeError(f"Could not load {path}")
+    return sim, time.perf_counter() - started
+
+
+def bench_cycle(sim, budget):
+    cycle = Cycle(sim.players, sim.hydras, sim.damage_matrix)
+    annealer = Annealer(sim.engine, random.Random(0))
+    assignments = [sim.engine.decode(annealer.random_targets()) for _ in range(16)]
+
+    evaluations, best_score = 0, 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < budget:
+        sim.reset_battle_state()
+        best_score = max(best_score, cycle.apply_assignment(assignments[evaluations % len(assignments)]))
+        evaluations += 1
+    seconds = time.perf_counter() - started
+    return {"evaluations": evaluations, "seconds": seconds, "best_score": best_score, "time_to_score": None}
+
+
+def bench_annealing(sim, budget):
+    annealer = Annealer(sim.engine, random.Random(0))
+    started = time.perf_counter()
+    _, best_score = annealer.run(deadline=time.monotonic() + budget)
+    seconds = time.perf_counter() - started
+    return {"evaluations": annealer.evaluations, "seconds": seconds, "best_score": best_score,
+            "time_to_score": annealer.best_elapsed}
+
+
+def bench_brute_force(sim, budget, chunk=100):
+    cycle = Cycle(sim.players, sim.hydras, sim.damage_matrix)
+    attempts, best_score, time_to_score = 0, 0, None
+    started = time.perf_counter()
+    while time.perf_counter() - started < budget:
+        _, score = cycle.brute_force(max_attempts=chunk)
+        attempts += chunk
+        if score > best_score:
+            best_score, time_to_score = score, time.perf_counter() - started
+    seconds = time.perf_counter() - started
+    return {"evaluations": attempts, "seconds": seconds, "best_score": best_score, "time_to_score": time_to_score}
+
+
+def bench_parallel(path, budget, n_simulations):
+    # One chain per task, so every worker runs one chain until the budget is spent.
+    # The workers' telemetry sums the moves every chain scored; its trace only keeps iteration 0.
+    telemetry = Telemetry(trace_every=2 ** 62)
+    started = time.perf_counter()
+    _, best_score = run_parallel_simulations(path, n_simulations=n_simulations, print_every=n_simulations,
+                                             chains_per_task=1, telemetry=telemetry,
+                                             anneal_options={"deadline": time.monotonic() + budget})
+    seconds = time.perf_counter() - started
+    return {"evaluations": telemetry.counters["evaluations"], "seconds": seconds, "best_score": best_score,
+            "time_to_score": None}
+
+
+def run_benchmark(players, sparsity, engines, budget, output, seed=0, parallel_simulations=None):
+    generator = SheetGenerator(seed)
+    commit = git_commit()
+    parallel_simulations = parallel_simulations or available_workers()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_players in players:
+            path = generator.write(os.path.join(tmp, f"synthetic_{n_players}.csv"), n_players, sparsity)
+            sim, load_seconds = load(path)
+            load_memory = peak_memory(lambda: load(path))
+            engine_pickle = pickle.dumps(sim.engine)
+            engine_memory = peak_memory(lambda: pickle.loads(engine_pickle))
+
+            for engine in engines:
+                if engine == "cycle":
+                    bench = lambda b: bench_cycle(sim, b)
+                elif engine == "annealing":
+                    bench = lambda b: bench_annealing(sim, b)
+                elif engine == "brute_force":
+                    bench = lambda b: bench_brute_force(sim, b)
+                elif engine == "parallel":
+                    bench = lambda b: bench_parallel(path, b, parallel_simulations)
+                else:
+                    print(f"[WARN] Unknown engine: {engine}")
+                    continue
+
+                result = bench(budget)
+                # Separate short pass, tracemalloc slows the timed one down too much
+                result["peak_memory_bytes"] = peak_memory(lambda: bench(min(budget, 0.2)))
+                result.update({
+                    "commit": commit,
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "engine": engine,
+                    "players": n_players,
+                    "sparsity": sparsity,
+                    "budget": budget,
+                    "evals_per_sec": result["evaluations"] / result["seconds"] if result["seconds"] else None,
+                    "load_seconds": load_seconds,
+                    "load_peak_memory_bytes": load_memory,
+                    "engine_pickle_bytes": len(engine_pickle),
+                    "engine_bytes_per_player": engine_memory / n_players,
+                })
+                print(f"[BENCH] {n_players:>5} players | {engine:<12} | {result['evals_per_sec']:>12,.1f} evals/s"
+                      f" | score {result['best_score']}")
+                with open(output, mode='a', encoding='utf-8') as out:
+                    out.write(json.dumps(result) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Hydra optimizers on synthetic sheets.")
+    parser.add_argument("--players", type=int, nargs="+", default=[10, 100, 500, 2000])
+    parser.add_argument("--sparsity", type=float, default=0.5, help="share of damage cells that are 0")
+    parser.add_argument("--engines", nargs="+", default=ENGINES, choices=ENGINES)
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds per engine and sheet size")
+    parser.add_argument("--parallel-simulations", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.jsonl")
+    args = parser.parse_args(argv)
+
+    run_benchmark(args.players, args.sparsity, args.engines, args.budget, args.output,
+                  seed=args.seed, parallel_simulations=args.parallel_simulations)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,39 @@
-import pandas as pd
 import random
 import math
 import os
-import csv
 
 from Player import Player
 from Hydra import Hydra
 from Head import Head
 from Cycle import Cycle
-from collections import defaultdict
+from BattleEngine import BattleEngine
+from Annealer import Annealer
+from GeneticOptimizer import GeneticOptimizer
+from TabuSearch import TabuSearch
+from MoveIndex import MoveIndex
+from Telemetry import Telemetry, span
+from ScoreCache import ScoreCache
+from SheetLoader import SheetLoader
+from AssignmentReport import AssignmentReport
+from Checkpoint import Checkpoint
+from SheetDiff import SheetDiff
+from RobustnessEvaluator import RobustnessEvaluator
+from AnnealingSettings import AnnealingSettings
 
 
 
 class HydraSimulator:
-    def __init__(self, csv_path):
+    def __init__(self, csv_path, telemetry=None):
         self.csv_path = csv_path
+        self.telemetry = telemetry  # optional Telemetry, see Telemetry.py
         self.players = []
         self.hydras = []
+        self.engine = None
+        self.move_index = None
 
     def read_csv(self):
+        # DataFrame view of the sheet; pandas is only imported when this is called
+        import pandas as pd
         try:
             return pd.read_csv(self.csv_path, sep=',', engine='python')
         except Exception as e:
@@ -26,44 +41,37 @@ class HydraSimulator:
             return None
 
     def load_data(self):
-        df = self.read_csv()
-        if df is None:
-            return False
+        with span(self.telemetry, "load_data"):
+            return self._load_data()
 
-        self.players.clear()
-        for index, row in df.iloc[:-1].iterrows():  # skip last row (heads health)
-            damage_data = row[1:].to_frame().T
-            damage_data.columns = df.columns[1:]
-            self.players.append(Player(row['Name'], damage_data))
+    def _load_data(self):
+        sheet = SheetLoader(self.csv_path)
+        if not sheet.load():
+            return False
 
         self.hydras.clear()
         hydra_map = {}
-        health_row = df.iloc[-1, 1:]
-
-        for column in df.columns[1:]:
-            try:
-                head_name, hydra_name = column.split(" - ")
-            except ValueError:
-                print(f"[WARN] Skipping malformed column header: {column}")
-                continue
-
-            hydra = hydra_map.setdefault(hydra_name, Hydra(hydra_name, []))
-            if hydra not in self.hydras:
+        for head_index, (column, head_name, hydra_name, health) in enumerate(sheet.heads):
+            hydra = hydra_map.get(hydra_name)
+            if hydra is None:
+                hydra = hydra_map[hydra_name] = Hydra(hydra_name, [])
                 self.hydras.append(hydra)
 
-            try:
-                health = int(str(health_row[column]).replace(",", ""))
-            except ValueError:
-                print(f"[WARN] Invalid health value in column '{column}': {health_row[column]}")
-                continue
-
-            head = Head(head_name, hydra)
-            head.startHealth = health
-            head.health = health
+            head = Head(head_name, hydra, health)
+            head.index = head_index
             hydra.heads.append(head)
 
+        # Damage cells are parsed once: rows are players, columns are head indices
+        self.damage_matrix = sheet.damage
+        self.players.clear()
+        for player_index, name in enumerate(sheet.names):
+            self.players.append(Player(name, self.damage_matrix[player_index], player_index))
+
         # Save the order of target columns (exclude first column like 'Name')
-        self.target_order = list(df.columns[1:])
+        self.target_order = list(sheet.columns)
+
+        self.engine = BattleEngine(self.players, self.hydras, self.damage_matrix)
+        self.move_index = MoveIndex(self.engine)
 
         return True
 
@@ -95,20 +103,21 @@ class HydraSimulator:
         for _ in range(mutations):
             retry_count = 0
             while retry_count < retry_limit:
-                player_name = random.choice(self.players).name
-                attack_idx = random.randint(0, 2)
-                valid_hydras = [h for h in self.hydras if h.is_alive() and any(head.is_alive() for head in h.heads)]
-                if not valid_hydras:
+                if not self.move_index.players:
                     break
-                hydra = random.choice(valid_hydras)
-                valid_heads = [head for head in hydra.heads if head.is_alive()]
-                if not valid_heads:
-                    retry_count += 1
-                    continue
-                head = random.choice(valid_heads)
+                # Only heads this player can damage, from the index built in load_data
+                player_id = random.choice(self.move_index.players)
+                player_name = self.engine.player_names[player_id]
+                attack_idx = random.randint(0, 2)
+                target = self.engine.head_label(self.move_index.sample(player_id, random))
 
-                if new_assignment[player_name][attack_idx] != (hydra.name, head.name):
-                    new_assignment[player_name][attack_idx] = (hydra.name, head.name)
+                # Greedy seeds and decoded assignments can leave a player fewer than 3 attacks
+                attacks = new_assignment.setdefault(player_name, [])
+                if attack_idx >= len(attacks):
+                    attacks.append(target)
+                    break
+                if attacks[attack_idx] != target:
+                    attacks[attack_idx] = target
                     break
                 else:
                     retry_count += 1
@@ -116,14 +125,35 @@ class HydraSimulator:
 
         return new_assignment
 
-    def simulated_annealing(self, cycle, max_iter=20000, initial_temp=1000, cooling_rate=0.995):
+    def tuned_settings(self):
+        # Settings saved by tune_annealing for this sheet's shape, {} if it was never tuned
+        return AnnealingSettings().lookup(self.engine) or {}
+
+    def target_score(self, gap):
+        # Score that is within `gap` of the sheet's upper bound, None to never stop early
+        return None if gap is None else self.engine.upper_bound() - gap
+
+    def simulated_annealing(self, cycle, max_iter=20000, initial_temp=1000, cooling_rate=0.995, seeding="random",
+                            target_score=None, objective=None, reheat_every=2000, patience=5000):
+        if isinstance(cycle, BattleEngine):
+            # Array engine: each move only replays the players after the first changed one
+            targets, best_score = Annealer(cycle).run(max_iter=max_iter, initial_temp=initial_temp,
+                                                      cooling_rate=cooling_rate, reheat_every=reheat_every,
+                                                      patience=patience, seeding=seeding,
+                                                      telemetry=self.telemetry, target_score=target_score,
+                                                      objective=objective)
+            return cycle.decode(targets), best_score
+
         temperature = initial_temp
         best_score = 0
         no_improve_counter = 0
-        patience = 5000
 
         self.reset_battle_state()
-        assignment = self.initialize_random_assignment()
+        if seeding == "random":
+            assignment = self.initialize_random_assignment()
+        else:
+            engine = BattleEngine(self.players, self.hydras, self.damage_matrix)
+            assignment = engine.decode(Annealer(engine).initial_targets(seeding))
         current_score = cycle.apply_assignment(assignment)
         best_assignment = {p: a[:] for p, a in assignment.items()}
 
@@ -132,7 +162,7 @@ class HydraSimulator:
                 #print("[INFO] Temperature too low, stopping.")
                 break
 
-            if i > 0 and i % 2000 == 0:
+            if i > 0 and i % reheat_every == 0:
                 temperature = initial_temp  # reheat
                 #print(f"[INFO] Reheating temperature at iteration {i}")
 
@@ -149,6 +179,8 @@ class HydraSimulator:
                     best_score = new_score
                     best_assignment = {p: a[:] for p, a in new_assignment.items()}
                     no_improve_counter = 0
+                    if target_score is not None and best_score >= target_score:
+                        break
                     #print(f"[INFO] Iter {i} | New Best Score: {best_score} | Temp: {temperature:.4f}")
                 else:
                     no_improve_counter += 1
@@ -164,14 +196,35 @@ class HydraSimulator:
 
         return best_assignment, best_score
 
-    def run_simulation(self):
+    def run_simulation(self, engine="array", seeding="random", gap=None, robustness=None):
+        # robustness: RobustnessEvaluator options, e.g. {"objective": "quantile"}, to optimize
+        # the expected or quantile score over damage rolls instead of the max-hit score
         if not self.players or not self.hydras:
             print("[ERROR] Players or Hydras not initialized. Aborting simulation.")
             return None, None, None
 
         #print("[INFO] Starting simulation round...")
-        cycle = Cycle(self.players, self.hydras)
-        best_assignment, score = self.simulated_annealing(cycle)
+        if robustness is not None and engine != "array":
+            print("[ERROR] Robustness scoring needs the array engine.")
+            return None, None
+        if engine == "array":
+            cycle = BattleEngine(self.players, self.hydras, self.damage_matrix)
+        elif engine == "cycle":
+            cycle = Cycle(self.players, self.hydras, self.damage_matrix)
+        else:
+            print(f"[ERROR] Unknown simulation engine: {engine}")
+            return None, None
+        objective = RobustnessEvaluator(cycle, **robustness) if robustness is not None else None
+        if objective is not None:
+            try:
+                objective.check_memory()
+            except ValueError as e:
+                print(f"[ERROR] {e}")
+                return None, None
+        with span(self.telemetry, "evaluation"):
+            best_assignment, score = self.simulated_annealing(cycle, seeding=seeding,
+                                                              target_score=self.target_score(gap),
+                                                              objective=objective, **self.tuned_settings())
 
         
         #print(f"[RESULT] Best assignment found | Total Score: {score}")
@@ -186,222 +239,693 @@ class HydraSimulator:
         #print("-" * 50)
         return best_assignment, score
 
-    def runBruteforce(self):
+    def run_tabu_search(self, max_iter=200, patience=40, tenure=10, seeding="greedy", gap=None):
+        if not self.players or not self.hydras:
+            print("[ERROR] Players or Hydras not initialized. Aborting simulation.")
+            return None, None
+
+        engine = BattleEngine(self.players, self.hydras, self.damage_matrix)
+        with span(self.telemetry, "evaluation"):
+            targets, score = TabuSearch(engine, move_index=self.move_index, tenure=tenure).run(
+                max_iter=max_iter, patience=patience, seeding=seeding, telemetry=self.telemetry,
+                target_score=self.target_score(gap))
+        return engine.decode(targets), score
+
+    def run_genetic(self, generations=300, population_size=200, gap=None):
+        if not self.players or not self.hydras:
+            print("[ERROR] Players or Hydras not initialized. Aborting simulation.")
+            return None, None
+
+        engine = BattleEngine(self.players, self.hydras, self.damage_matrix)
+        optimizer = GeneticOptimizer(engine, population_size=population_size)
+        targets, score = optimizer.run(generations=generations, target_score=self.target_score(gap))
+        return engine.decode(targets), score
+
+    def run_branch_and_bound(self, node_limit=200000, time_limit=None, gap=None):
+        if not self.players or not self.hydras:
+            print("[ERROR] Players or Hydras not initialized. Aborting simulation.")
+            return None, None
+
+        cycle = Cycle(self.players, self.hydras, self.damage_matrix)
+        assignment, score, gap = cycle.branch_and_bound(node_limit=node_limit, time_limit=time_limit,
+                                                        target_score=self.target_score(gap))
+        if gap == 0:
+            print(f"[RESULT] Proven optimal | Total Score: {score}")
+        else:
+            print(f"[RESULT] Search limit reached | Total Score: {score} | At most {gap} below the optimum")
+        return assignment, score
+
+    def runBruteforce(self, gap=None):
         if not self.players or not self.hydras:
             print("[ERROR] Players or Hydras not initialized. Aborting simulation.")
             return None, None, None
 
         print("[INFO] Starting brute force simulation round...")
-        cycle = Cycle(self.players, self.hydras)
-        raw_assignment, score = cycle.brute_force(max_attempts=10000)
+        cycle = Cycle(self.players, self.hydras, self.damage_matrix)
+        raw_assignment, score = cycle.brute_force(max_attempts=10000, target_score=self.target_score(gap))
 
         # Convert from attack_log list to expected dict format
         assignment_dict = {}
-        for player_name, hydra_name, head_name, damage, worth in raw_assignment:
+        for player_name, hydra_name, head_name, damage, worth in raw_assignment or []:
             assignment_dict.setdefault(player_name, []).append((hydra_name, head_name))
 
         return assignment_dict, score
     
     def print_assignment_summary(self, assignment, score):
-        from collections import defaultdict
+        with span(self.telemetry, "reporting"):
+            self._print_assignment_summary(assignment, score)
 
-        summary = defaultdict(list)
+    def _print_assignment_summary(self, assignment, score):
+        AssignmentReport.from_assignment(self.engine, assignment, score, self.target_order).print_summary()
 
-        # Build summary dictionary
-        for player in self.players:
-            if player.name not in assignment:
-                continue
-            for hydra_name, head_name in assignment[player.name]:
-                key = f"{head_name} - {hydra_name}"  # format must match CSV header exactly
-                hydra = next((h for h in self.hydras if h.name == hydra_name), None)
-                if not hydra:
-                    continue
-                head = next((hd for hd in hydra.heads if hd.name == head_name), None)
-                if not head:
-                    continue
-                damage = player.DamageToHead(hydra, head)
-                summary[key].append((player.name, damage))
+    def print_robustness(self, assignment, score=None, n_samples=2000, spread=0.1):
+        # Expected score and per-head kill chances when hits land between (1 - spread) and 100% of max
+        RobustnessEvaluator(self.engine, n_samples, spread).print_report(self.engine.encode(assignment), score)
 
-        print("\n[DETAILED TARGET BREAKDOWN]")
-        print("-" * 50)
+    def export_assignment_summary_csv(self, assignment, score, filename="assignment_summary_long.csv"):
+        with span(self.telemetry, "reporting"):
+            self._export_assignment_summary_csv(assignment, score, filename)
 
-        # Print by original CSV order
-        for target in self.target_order:
-            if target not in summary:
-                continue
+    def _export_assignment_summary_csv(self, assignment, score, filename):
+        AssignmentReport.from_assignment(self.engine, assignment, score, self.target_order).write_csv(filename)
 
-            print(f"\n{target}:")
-            total_damage = 0
 
-            for player_name, damage in summary[target]:
-                if damage == 0:
-                    continue  # Skip players with 0 damage
-                total_damage += damage
-                print(f"  {player_name:<20} {damage:>12,}")
 
-            # Extract head and hydra names from target
-            try:
-                head_name, hydra_name = [s.strip() for s in target.split(" - ")]
-            except ValueError:
-                print("  [ERROR] Invalid target format")
-                continue
 
-            # Find the head object to compute remaining HP
-            hydra = next((h for h in self.hydras if h.name == hydra_name), None)
-            head = next((hd for hd in hydra.heads if hd.name == head_name), None) if hydra else None
 
-            if head:
-                remaining_hp = max(head.startHealth - total_damage, 0)
-                print(f"{'REMAINING HP':<22} {remaining_hp:>12,}")
+import argparse
+import concurrent.futures
+import contextlib
+import io
+import multiprocessing
+import sys
+import time
+
+def available_workers():
+    # Cores this process may actually run on, not just the machine total
+    try:
+        return max(len(os.sched_getaffinity(0)), 1)
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# Read-only problem shared by every chain a worker runs, set once by the pool initializer
+_worker_engine = None
+_worker_engines = {}  # sheet key -> engine, for batch runs over several sheets
+_worker_stop = None
+_worker_caches = {}  # sheet key -> ScoreCache shared by every chain this worker runs
+
+
+def _worker_cache(engine, sheet, cache_size):
+    cache = _worker_caches.get(sheet)
+    if cache is None or cache.max_entries != cache_size:
+        cache = _worker_caches[sheet] = ScoreCache(engine, cache_size)
+    return cache
+
+
+def _init_worker(engine, stop_event=None, engines=None):
+    global _worker_engine, _worker_engines, _worker_stop
+    _worker_engine = engine
+    _worker_engines = engines or {}
+    _worker_stop = stop_event
+
+
+def run_annealing_chains(n_chains, seed, seeding="random", anneal_options=None, trace_every=None, sheet=None,
+                         cache_size=None, optimizer="annealing"):
+    # Runs several chains per task so one round trip carries a whole batch of work.
+    # With cache_size, the chains share this worker's ScoreCache for the sheet.
+    # optimizer "tabu" runs TabuSearch chains instead, anneal_options then go to TabuSearch.run.
+    engine = _worker_engines[sheet] if sheet is not None else _worker_engine
+    target_score = (anneal_options or {}).get("target_score")
+    rng = random.Random(seed)
+    # Every task counts its chains from 0, so the task seed keeps (source, chain) unique in the merged trace
+    telemetry = Telemetry(trace_every, source=f"worker-{os.getpid()}-{seed:016x}") if trace_every else None
+    cache = _worker_cache(engine, sheet, cache_size) if cache_size else None
+    best_targets, best_score = None, -1
+    for _ in range(n_chains):
+        with span(telemetry, "evaluation"):
+            if optimizer == "tabu":
+                search = TabuSearch(engine, rng)
             else:
-                print(f"{'REMAINING HP':<22} {'N/A':>12}")
-
-        print("-" * 50)
-
-        # Count total heads killed (health <= 0)
-        heads_killed = 0
-        total_heads = 0
-        for hydra in self.hydras:
-            for head in hydra.heads:
-                total_heads += 1
-                if head.health <= 0:
-                    heads_killed += 1
-
-        # Print final summary
-        print("\n[FINAL SUMMARY]")
-        print(f"Total heads killed: {heads_killed} / {total_heads}")
-        print(f"Total score: {score:,}")
-
-
-    def export_assignment_summary_csv(self, assignment, score, filename="assignment_summary_long.csv"):
-        summary = defaultdict(list)
-
-        # Build summary dictionary: target -> list of (player_name, damage)
-        for player in self.players:
-            if player.name not in assignment:
-                continue
-            for hydra_name, head_name in assignment[player.name]:
-                target = f"{head_name} - {hydra_name}"
-                hydra = next((h for h in self.hydras if h.name == hydra_name), None)
-                if not hydra:
-                    continue
-                head = next((hd for hd in hydra.heads if hd.name == head_name), None)
-                if not head:
-                    continue
-                damage = player.DamageToHead(hydra, head)
-                summary[target].append((player.name, damage))
-
-        with open(filename, mode='w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
+                search = Annealer(engine, rng, cache=cache)
+            targets, score = search.run(seeding=seeding, telemetry=telemetry, **(anneal_options or {}))
+        if score > best_score:
+            best_targets, best_score = targets, score
+        if target_score is not None and best_score >= target_score:
+            break
+    if telemetry is not None and cache is not None:
+        telemetry.gauge(f"cache_entries[{os.getpid()}]", len(cache))
+        telemetry.gauge(f"cache_bytes[{os.getpid()}]", cache.memory_bytes())
+    return best_targets, best_score, telemetry
+
+
+def run_annealing_for(time_limit, seed, engine=None, stop_event=None, anneal_options=None):
+    # One chain that gives up at the time limit or when the pool's stop event is set.
+    # Pools shared by several sheets (OptimizerService) send the engine and a per-job stop event with the task.
+    # anneal_options: extra Annealer.run settings, e.g. the sheet's tuned settings.
+    annealer = Annealer(engine if engine is not None else _worker_engine, random.Random(seed))
+    targets, score = annealer.run(deadline=time.monotonic() + time_limit,
+                                  stop_event=stop_event if stop_event is not None else _worker_stop,
+                                  **(anneal_options or {}))
+    return targets, score, annealer.evaluations
+
+
+def optimize(csv_path, time_budget, progress=None, cancel=None, max_workers=None, gap=None):
+    """Anytime annealing: keeps every worker busy until `time_budget` seconds pass.
+
+    progress(best_score, evaluations, elapsed) is called after every finished
+    chain. Setting `cancel` (anything with is_set(), e.g. threading.Event)
+    stops all workers at their next check, and so does a best score within
+    `gap` of the sheet's upper bound. Returns the best (assignment, score)
+    found so far.
+    """
+    started = time.monotonic()
+    deadline = started + time_budget
 
-            # Write header
-            writer.writerow(["Target", "Person", "Damage", "Target Total"])
-
-            targets_killed = 0
-
-            for target in self.target_order:
-                players = summary.get(target, [])
-                total_damage = sum(dmg for _, dmg in players)
-
-                if not players:
-                    # No one attacked this target
-                    writer.writerow([target, "", "❌ Unreachable", 0])
-                    writer.writerow([target, "", "❌ Unreachable", 0])
-                    continue
+    sim = HydraSimulator(csv_path)
+    if not sim.load_data():
+        return None, 0
+    engine = BattleEngine(sim.players, sim.hydras, sim.damage_matrix)
+    target_score = sim.target_score(gap)
+    tuned = sim.tuned_settings()
+
+    if max_workers is None:
+        max_workers = available_workers()
+
+    best_targets, best_score = None, 0
+    evaluations = 0
+    stop_event = multiprocessing.Event()
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                                      initargs=(engine, stop_event))
+    try:
+        pending = set()
+        while True:
+            remaining = deadline - time.monotonic()
+            stopping = (remaining <= 0 or (cancel is not None and cancel.is_set())
+                        or (target_score is not None and best_targets is not None and best_score >= target_score))
+            if stopping:
+                stop_event.set()
+            else:
+                while len(pending) < max_workers:
+                    pending.add(executor.submit(run_annealing_for, remaining, random.getrandbits(64), None, None,
+                                                tuned))
+            if not pending:
+                break
 
-                # Find the head and startHealth to know kill threshold
+            # Wake up regularly so cancellation is noticed even while every chain is still running
+            done, pending = concurrent.futures.wait(pending, timeout=0.1,
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
                 try:
-                    head_name, hydra_name = [s.strip() for s in target.split(" - ")]
-                    hydra = next((h for h in self.hydras if h.name == hydra_name), None)
-                    head = next((hd for hd in hydra.heads if hd.name == head_name), None) if hydra else None
-                    if not head:
-                        raise ValueError("Head not found")
-                    start_health = head.startHealth
-                except Exception:
-                    # If can't find head info, write all players anyway (fallback)
-                    for player_name, damage in players:
-                        if damage > 0:
-                            writer.writerow([target, player_name, damage, ""])
-                    writer.writerow([target, "", "❌ Unknown Target", 0])
+                    targets, score, chain_evaluations = future.result()
+                except Exception as e:
+                    print(f"[ERROR] Simulation failed: {e}")
                     continue
-
-                # Sort players by damage descending
-                players_sorted = sorted(players, key=lambda x: x[1], reverse=True)
-
-                accumulated = 0
-                required_players = []
-                for player_name, damage in players_sorted:
-                    if damage == 0:
-                        continue
-                    if accumulated < start_health:
-                        required_players.append((player_name, damage))
-                        accumulated += damage
-                    else:
-                        # Already reached kill threshold
-                        break
-
-                # Write only required players
-                for player_name, damage in required_players:
-                    writer.writerow([target, player_name, damage, ""])
-
-                # Write reached/not reached summary row
-                if accumulated >= start_health:
-                    writer.writerow([target, "", "✅ Reached", start_health])
-                    targets_killed += 1
-                else:
-                    writer.writerow([target, "", "❌ Not Reached", 0])
-
-            # Write summary rows
-            writer.writerow([])
-            writer.writerow(["Targets Killed", targets_killed, "", ""])
-            writer.writerow(["Total Value", score, "", ""])
-
+                evaluations += chain_evaluations
+                if best_targets is None or score > best_score:
+                    best_targets, best_score = targets, score
+                if progress is not None:
+                    progress(best_score, evaluations, time.monotonic() - started)
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    if best_targets is None:
+        return None, 0
+    return engine.decode(best_targets), best_score
 
 
+def run_replica(targets, temperature, n_steps, seed, target_score=None):
+    annealer = Annealer(_worker_engine, random.Random(seed))
+    if targets is None:
+        targets = annealer.random_targets()
+    return annealer.sample(targets, temperature, n_steps, target_score=target_score)
 
 
-import concurrent.futures
+def run_parallel_tempering(csv_path, n_replicas=8, t_min=5.0, t_max=1000.0, rounds=200,
+                           steps_per_round=500, max_workers=None, gap=None):
+    """Replica exchange: one Metropolis chain per temperature, neighbours swap between rounds.
 
-def run_single_simulation(csv_path):
+    Temperatures are spaced geometrically from t_min to t_max. After each
+    round of `steps_per_round` moves, even or odd neighbour pairs (alternating)
+    try to swap states. Per-replica acceptance and per-pair swap rates are
+    printed at the end so the ladder can be tuned. With a gap, the run ends
+    after the round whose best score is within `gap` of the upper bound.
+    """
     sim = HydraSimulator(csv_path)
     if not sim.load_data():
         return None, 0
-    return sim.run_simulation()  # returns assignment, score
+    engine = BattleEngine(sim.players, sim.hydras, sim.damage_matrix)
+    target_score = sim.target_score(gap)
+
+    if max_workers is None:
+        max_workers = available_workers()
+
+    n_replicas = max(n_replicas, 2)
+    ratio = (t_max / t_min) ** (1.0 / (n_replicas - 1))
+    temperatures = [t_min * ratio ** i for i in range(n_replicas)]
+
+    states = [None] * n_replicas
+    scores = [0] * n_replicas
+    accepted = [0] * n_replicas
+    swap_attempts = [0] * (n_replicas - 1)
+    swap_accepts = [0] * (n_replicas - 1)
+    best_targets, best_score = None, -1
+    rounds_run = 0
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                                initargs=(engine,)) as executor:
+        for round_index in range(rounds):
+            futures = [executor.submit(run_replica, states[i], temperatures[i], steps_per_round,
+                                       random.getrandbits(64), target_score) for i in range(n_replicas)]
+            for i, future in enumerate(futures):
+                states[i], scores[i], round_best_targets, round_best_score, round_accepted = future.result()
+                accepted[i] += round_accepted
+                if round_best_score > best_score:
+                    best_targets, best_score = round_best_targets, round_best_score
+            rounds_run += 1
+
+            if target_score is not None and best_score >= target_score:
+                print(f"[INFO] Within {gap} of the upper bound {engine.upper_bound()} after round {rounds_run}.")
+                break
 
-def run_parallel_simulations(csv_path, n_simulations=100, max_workers=os.cpu_count() - 1, print_every=10):
+            for i in range(round_index % 2, n_replicas - 1, 2):
+                swap_attempts[i] += 1
+                log_ratio = (scores[i + 1] - scores[i]) * (1.0 / temperatures[i] - 1.0 / temperatures[i + 1])
+                if log_ratio >= 0 or random.random() < math.exp(log_ratio):
+                    states[i], states[i + 1] = states[i + 1], states[i]
+                    scores[i], scores[i + 1] = scores[i + 1], scores[i]
+                    swap_accepts[i] += 1
+
+    print("\n[INFO] Parallel tempering ladder")
+    print(f"{'Replica':<8} {'Temp':>10} {'Accept':>8} {'Swap up':>8}")
+    for i, temperature in enumerate(temperatures):
+        accept_rate = accepted[i] / (rounds_run * steps_per_round)
+        swap = f"{swap_accepts[i] / swap_attempts[i]:.2%}" if i < n_replicas - 1 and swap_attempts[i] else "-"
+        print(f"{i:<8} {temperature:>10.2f} {accept_rate:>8.2%} {swap:>8}")
+
+    return engine.decode(best_targets), best_score
+
+
+def run_parallel_simulations(csv_path, n_simulations=100, max_workers=None, print_every=10, chains_per_task=4,
+                             seeding="random", anneal_options=None, telemetry=None, cache_size=None,
+                             optimizer="annealing", gap=None, checkpoint=None, checkpoint_every=30.0,
+                             resume=False, warm_start=None, robustness=None):
+    # The sheet is parsed once here; workers only receive the compact BattleEngine.
+    # With a Telemetry, every worker traces its chains and the traces are merged into it.
+    # cache_size turns on a per-worker ScoreCache; its hit rate shows up in the telemetry.
+    # With a gap, the run ends once the best score is within `gap` of the sheet's upper bound.
+    # checkpoint: file saved every `checkpoint_every` seconds and at the end; with resume, a run
+    # of the same sheet continues from it. warm_start: checkpoint whose assignments seed the first tasks.
+    # robustness: RobustnessEvaluator options; the chains then maximize the expected or quantile score.
+    sim = HydraSimulator(csv_path, telemetry)
+    if not sim.load_data():
+        return None, 0
+    engine = BattleEngine(sim.players, sim.hydras, sim.damage_matrix)
+    # Saved with the checkpoint, so --resume continues the run the way it was started
+    settings = {"optimizer": optimizer, "seeding": seeding, "chains_per_task": chains_per_task,
+                "anneal_options": anneal_options, "gap": gap, "cache_size": cache_size, "robustness": robustness}
+    target_score = sim.target_score(gap)
+    if target_score is not None:
+        anneal_options = dict(anneal_options or {}, target_score=target_score)
+    if robustness is not None and optimizer != "annealing":
+        print(f"[ERROR] Robustness scoring needs the annealing optimizer, not {optimizer}.")
+        return None, 0
+    if robustness is not None:
+        objective = RobustnessEvaluator(engine, **robustness)
+        try:
+            objective.check_memory()
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            return None, 0
+        anneal_options = dict(anneal_options or {}, objective=objective)
+    tuned = sim.tuned_settings() if optimizer == "annealing" else {}
+    if tuned:
+        # Tuned settings fill in whatever the caller did not set explicitly
+        anneal_options = dict(tuned, **(anneal_options or {}))
+        print(f"[INFO] Using tuned annealing settings for {AnnealingSettings.shape(engine)}")
+
+    if max_workers is None:
+        max_workers = available_workers()
+
+    rng = random.Random()
+    completed = 0
     results = []
-    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(run_single_simulation, csv_path) for _ in range(n_simulations)]
-
-        completed = 0
+    fingerprint = Checkpoint.fingerprint(engine)
+    saved = Checkpoint(checkpoint).load() if checkpoint is not None and resume else None
+    if saved is not None:
+        if saved["fingerprint"] != fingerprint:
+            print(f"[WARN] Checkpoint {checkpoint} belongs to a different sheet, starting over.")
+        else:
+            n_simulations = saved["n_simulations"]
+            completed = saved["completed"]
+            Checkpoint.restore_rng(rng, saved["rng_state"])
+            results = [(engine.encode(entry["assignment"]).tolist(), entry["score"]) for entry in saved["best"]]
+            print(f"[INFO] Resuming from {checkpoint}: {completed} / {n_simulations} simulations done.")
+
+    def save_checkpoint():
+        Checkpoint(checkpoint).save({
+            "sheet": csv_path,
+            "fingerprint": fingerprint,
+            "n_simulations": n_simulations,
+            "completed": completed,
+            "rng_state": Checkpoint.rng_state(rng),
+            "best": Checkpoint.best_entries(engine, results),
+            "settings": settings,
+        })
+
+    warm_starts = Checkpoint(warm_start).warm_starts(engine) if warm_start is not None else []
+    remaining = n_simulations - completed
+    batches = [min(chains_per_task, remaining - start) for start in range(0, remaining, chains_per_task)]
+    last_saved = time.monotonic()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                                initargs=(engine,)) as executor:
+        futures = {}
+        for task, n_chains in enumerate(batches):
+            options = anneal_options
+            if task < len(warm_starts):
+                options = dict(anneal_options or {}, initial=warm_starts[task])
+            futures[executor.submit(run_annealing_chains, n_chains, rng.getrandbits(64), seeding,
+                                    options, telemetry.trace_every if telemetry else None, None,
+                                    cache_size, optimizer)] = n_chains
+
+        reported = completed // print_every
         for future in concurrent.futures.as_completed(futures):
             try:
-                assignment, score = future.result()
-                if assignment is not None:
-                    results.append((assignment, score))
+                targets, score, worker_telemetry = future.result()
+                if targets is not None:
+                    results.append((targets, score))
+                if telemetry is not None and worker_telemetry is not None:
+                    telemetry.merge(worker_telemetry)
             except Exception as e:
                 print(f"[ERROR] Simulation failed: {e}")
 
-            completed += 1
+            completed += futures[future]
             # Print progress every `print_every` simulations or at the end
-            if completed % print_every == 0 or completed == n_simulations:
-                best_assignment, best_score = max(results, key=lambda x: x[1]) if results else (None, 0)
+            if completed // print_every > reported or completed == n_simulations:
+                reported = completed // print_every
+                best_score = max(score for _, score in results) if results else 0
                 print(f"\n[INFO] Completed {completed} / {n_simulations} simulations. Current best score: {best_score}")
 
+            if checkpoint is not None and time.monotonic() - last_saved >= checkpoint_every:
+                save_checkpoint()
+                last_saved = time.monotonic()
+
+            if target_score is not None and results and max(score for _, score in results) >= target_score:
+                print(f"[INFO] Within {gap} of the upper bound {engine.upper_bound()}, skipping the remaining simulations.")
+                for pending in futures:
+                    pending.cancel()
+                break
+
+    if checkpoint is not None:
+        save_checkpoint()
+
     if not results:
         return None, 0
 
-    best_assignment, best_score = max(results, key=lambda x: x[1])
-    return best_assignment, best_score
+    best_targets, best_score = max(results, key=lambda x: x[1])
+    return engine.decode(best_targets), best_score
 
 
 
    
         
 
-if __name__ == "__main__":
+def reoptimize(old_csv, new_csv, previous_assignment, max_iter=100, patience=10, seed=None):
+    """Re-optimizes an edited sheet, starting from the previous best assignment.
+
+    The sheets are diffed by player name and head label (SheetDiff).
+    Players still in the sheet keep their previous attacks, minus targets
+    they can no longer damage. Only the affected players, plus the players
+    sharing heads with them or with removed players, are moved by a short
+    TabuSearch; everyone else keeps their attacks. The start is already
+    close, so the search gives up sooner than a full run (patience 10, not
+    40). Returns (assignment, score, diff).
+    """
+    old_sim, new_sim = HydraSimulator(old_csv), HydraSimulator(new_csv)
+    if not old_sim.load_data() or not new_sim.load_data():
+        return None, 0, None
+    engine = new_sim.engine
+    diff = SheetDiff(old_sim.engine, engine)
+    diff.print_summary()
+
+    initial = engine.encode(previous_assignment).tolist()
+    for player_id, row in enumerate(initial):
+        for slot, head_id in enumerate(row):
+            if not new_sim.move_index.can_damage(player_id, head_id):
+                row[slot] = -1
+
+    affected = diff.affected_players(engine, previous_assignment)
+    touched = {head_id for player_id in affected for head_id in initial[player_id] if head_id >= 0}
+    # Heads the removed players attacked may no longer die, so whoever else attacks them may move too
+    touched.update(engine.head_ids[tuple(target)] for name in diff.removed_players
+                   for target in previous_assignment.get(name, []) if tuple(target) in engine.head_ids)
+    focus = affected + [player_id for player_id, row in enumerate(initial)
+                        if player_id not in affected and touched.intersection(row)]
+    if not focus:
+        return engine.decode(initial), engine.evaluate(initial), diff
+
+    print(f"[INFO] Re-optimizing {len(focus)} of {engine.n_players} players ({len(affected)} affected)")
+    search = TabuSearch(engine, random.Random(seed), MoveIndex(engine, players=focus))
+    targets, score = search.run(max_iter=max_iter, patience=patience, initial=initial)
+    return engine.decode(targets), score, diff
+
+
+def tune_annealing(csv_path, n_configs=27, eta=3, chains=2, max_workers=None, seed=None, settings_path=None):
+    """Races annealing settings on a sheet with successive halving and saves the winner.
+
+    Every round runs each surviving configuration for `chains` times eta^round
+    more chains across the pool, ranks them by their mean best score over
+    all chains so far and keeps the top 1/eta. The default settings always
+    enter the race as the baseline, and their mean is reported next to the
+    winner's. The winner is stored per sheet shape (AnnealingSettings) and picked up
+    automatically by run_simulation, run_parallel_simulations, optimize, run_batch
+    and the OptimizerService.
+    Returns (options, mean score).
+    """
+    sim = HydraSimulator(csv_path)
+    if not sim.load_data():
+        return None, 0
+    engine = sim.engine
+    settings = AnnealingSettings(settings_path) if settings_path else AnnealingSettings()
+    rng = random.Random(seed)
+    configs = settings.candidates(engine, n_configs, rng)
+    scores = [[] for _ in configs]
+
+    if max_workers is None:
+        max_workers = available_workers()
+
+    alive = list(range(len(configs)))
+    race_round = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                                initargs=(engine,)) as executor:
+        while True:
+            n_chains = chains * eta ** race_round
+            futures = {executor.submit(run_annealing_chains, 1, rng.getrandbits(64), "random", configs[i]): i
+                       for i in alive for _ in range(n_chains)}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    _, score, _ = future.result()
+                except Exception as e:
+                    print(f"[ERROR] Tuning chain failed: {e}")
+                    continue
+                scores[futures[future]].append(score)
+
+            mean = lambda i: sum(scores[i]) / len(scores[i]) if scores[i] else -1
+            alive.sort(key=mean, reverse=True)
+            print(f"[INFO] Round {race_round + 1}: {len(alive)} configurations x {n_chains} chains, "
+                  f"best mean score {mean(alive[0]):.1f}")
+            alive = alive[:max(1, len(alive) // eta)]
+            if len(alive) == 1:
+                break  # the winner is decided, another round would only re-measure it
+            race_round += 1
+
+    best = alive[0]
+    best_mean = mean(best)
+    settings.save(engine, configs[best], best_mean, sheet=csv_path)
+    print(f"[RESULT] Tuned settings for {AnnealingSettings.shape(engine)}: {configs[best]} "
+          f"| mean score {best_mean:.1f} (defaults: {mean(0):.1f} over {len(scores[0])} chains)")
+    return configs[best], best_mean
+
+
+def tune_main(argv):
+    parser = argparse.ArgumentParser(description="Tune the annealing settings for a sheet.")
+    parser.add_argument("--tune", required=True, metavar="SHEET")
+    parser.add_argument("--configs", type=int, default=27)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--chains", type=int, default=2, help="chains per configuration in the first round")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    tune_annealing(args.tune, n_configs=args.configs, eta=args.eta, chains=args.chains,
+                   max_workers=args.workers, seed=args.seed)
+
+
+def find_sheets(sources):
+    # Directories contribute every *.csv inside them, files are taken as given
+    sheets = []
+    for source in sources:
+        if os.path.isdir(source):
+            sheets.extend(sorted(os.path.join(source, name) for name in os.listdir(source)
+                                 if name.lower().endswith(".csv")))
+        else:
+            sheets.append(source)
+    return sheets
+
+
+def run_batch(sources, output_dir=None, chains_per_sheet=100, max_workers=None, chains_per_task=4,
+              seeding="random"):
+    """Optimizes several guild sheets on one shared process pool.
+
+    Every sheet is loaded once in the parent and every worker receives all
+    of them through the pool initializer, so the pool starts once. Tasks are
+    queued round-robin across sheets, which gives each sheet the same share
+    of the CPU while all of them are running and lets the remaining sheets
+    use every core once one is done. Writes `<sheet>_summary.csv` per sheet
+    (next to the sheet, or into output_dir) and returns {sheet: (assignment, score)}.
+    """
+    simulators = {}
+    for path in find_sheets(sources):
+        sim = HydraSimulator(path)
+        with contextlib.redirect_stdout(io.StringIO()) as log:
+            loaded = sim.load_data()
+        if not loaded or not sim.players or not sim.hydras:
+            print(f"[WARN] Skipping {path}: not a usable Hydra sheet")
+            continue
+        print(log.getvalue(), end="")
+        simulators[path] = sim
+
+    if not simulators:
+        print("[ERROR] No usable sheets found.")
+        return {}
+
+    if max_workers is None:
+        max_workers = available_workers()
+    engines = {path: sim.engine for path, sim in simulators.items()}
+    tuned = {path: sim.tuned_settings() or None for path, sim in simulators.items()}
+
+    # Round-robin: batch i of every sheet is queued before batch i + 1 of any sheet
+    batches = [min(chains_per_task, chains_per_sheet - start) for start in range(0, chains_per_sheet, chains_per_task)]
+    best = {path: (None, -1) for path in simulators}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                                initargs=(None, None, engines)) as executor:
+        futures = {}
+        for n_chains in batches:
+            for path in simulators:
+                future = executor.submit(run_annealing_chains, n_chains, random.getrandbits(64), seeding,
+                                         tuned[path], None, path)
+                futures[future] = path
+
+        remaining = {path: len(batches) for path in simulators}
+        for future in concurrent.futures.as_completed(futures):
+            path = futures[future]
+            try:
+                targets, score, _ = future.result()
+                if targets is not None and score > best[path][1]:
+                    best[path] = (targets, score)
+            except Exception as e:
+                print(f"[ERROR] Simulation failed for {path}: {e}")
+
+            remaining[path] -= 1
+            if remaining[path] == 0:
+                print(f"[INFO] Finished {path} | Best score: {best[path][1]}")
+
+    results = {}
+    for path, sim in simulators.items():
+        targets, score = best[path]
+        if targets is None:
+            continue
+        assignment = sim.engine.decode(targets)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        directory = output_dir if output_dir is not None else os.path.dirname(path)
+        if output_dir is not None:
+            os.makedirs(output_dir, exist_ok=True)
+        sim.export_assignment_summary_csv(assignment, score, os.path.join(directory, f"{stem}_summary.csv"))
+        results[path] = (assignment, score)
+    return results
+
+
+def batch_main(argv):
+    parser = argparse.ArgumentParser(description="Optimize several Hydra sheets without prompts.")
+    parser.add_argument("--batch", nargs="+", required=True, metavar="SHEET_OR_DIR")
+    parser.add_argument("--output-dir", default=None)
+    parser.add_argument("--chains", type=int, default=100, help="annealing chains per sheet")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seeding", default="random", choices=["random", "greedy", "greedy-randomized"])
+    args = parser.parse_args(argv)
+    run_batch(args.batch, output_dir=args.output_dir, chains_per_sheet=args.chains,
+              max_workers=args.workers, seeding=args.seeding)
+
+
+def resume_main(argv):
+    parser = argparse.ArgumentParser(description="Continue a checkpointed parallel run.")
+    parser.add_argument("--resume", required=True, metavar="CHECKPOINT")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="my_hydra_summary.csv")
+    parser.add_argument("--robustness", action="store_true", help="also report expected score and kill chances")
+    args = parser.parse_args(argv)
+
+    state = Checkpoint(args.resume).load()
+    if state is None:
+        print(f"[ERROR] No usable checkpoint at {args.resume}")
+        return
+    # Optimizer, seeding, gap and the other options the run was started with
+    settings = state.get("settings", {})
+    best_assignment, highest_score = run_parallel_simulations(state["sheet"], n_simulations=state["n_simulations"],
+                                                              max_workers=args.workers, checkpoint=args.resume,
+                                                              resume=True, **settings)
+    if best_assignment is not None:
+        simulator = HydraSimulator(state["sheet"])
+        simulator.load_data()
+        simulator.print_assignment_summary(best_assignment, highest_score)
+        simulator.export_assignment_summary_csv(best_assignment, highest_score, args.output)
+        if args.robustness:
+            simulator.print_robustness(best_assignment, highest_score)
+
+
+def reoptimize_main(argv):
+    parser = argparse.ArgumentParser(description="Re-optimize an edited sheet from a previous run's checkpoint.")
+    parser.add_argument("--reoptimize", nargs=2, required=True, metavar=("OLD_SHEET", "NEW_SHEET"))
+    parser.add_argument("--previous", required=True, metavar="CHECKPOINT",
+                        help="checkpoint of the old sheet's run, its best assignment is the starting point")
+    parser.add_argument("--output", default="my_hydra_summary.csv")
+    parser.add_argument("--robustness", action="store_true", help="also report expected score and kill chances")
+    args = parser.parse_args(argv)
+
+    state = Checkpoint(args.previous).load()
+    if state is None or not state.get("best"):
+        print(f"[ERROR] No assignment stored in {args.previous}")
+        return
+    previous = {player: [tuple(target) for target in targets]
+                for player, targets in state["best"][0]["assignment"].items()}
+
+    old_csv, new_csv = args.reoptimize
+    best_assignment, highest_score, _ = reoptimize(old_csv, new_csv, previous)
+    if best_assignment is not None:
+        print(f"[RESULT] Re-optimized assignment | Total Score: {highest_score}")
+        simulator = HydraSimulator(new_csv)
+        simulator.load_data()
+        simulator.print_assignment_summary(best_assignment, highest_score)
+        simulator.export_assignment_summary_csv(best_assignment, highest_score, args.output)
+        if args.robustness:
+            simulator.print_robustness(best_assignment, highest_score)
+
+
+if __name__ == "__main__" and "--tune" in sys.argv[1:]:
+    tune_main(sys.argv[1:])
+
+elif __name__ == "__main__" and "--reoptimize" in sys.argv[1:]:
+    reoptimize_main(sys.argv[1:])
+
+elif __name__ == "__main__" and "--batch" in sys.argv[1:]:
+    batch_main(sys.argv[1:])
+
+elif __name__ == "__main__" and "--resume" in sys.argv[1:]:
+    resume_main(sys.argv[1:])
+
+elif __name__ == "__main__":
     simulator = HydraSimulator(r'.\Hero Wars - Brasil - HydraHelperSheet.csv')
-    input_string = input("press SA to start simulated annealing, P for Parallel runs, otherwise press any for brute force: ")
+    input_string = input("press SA to start simulated annealing, P for Parallel runs, PT for parallel tempering, TS for tabu search, PTS for parallel tabu search, GA for the genetic optimizer, otherwise press any for brute force: ")
     
 
     if simulator.load_data():
@@ -428,13 +952,13 @@ if __name__ == "__main__":
                     print(f"{player:<25} {hydra_name:<15} {head_name:<15}")
             print("-" * 50)
             
-        if input_string == "P":
+        elif input_string == "P":
             try:
                 n_sim = int(input("Enter number of simulations to run: "))
             except ValueError:
                 n_sim = 100  # default fallback
             print("[INFO] Running parallel simulations...")
-            best_assignment, highest_score = run_parallel_simulations(simulator.csv_path, n_simulations=n_sim, max_workers=8)
+            best_assignment, highest_score = run_parallel_simulations(simulator.csv_path, n_simulations=n_sim)
             print(f"\n[FINAL RESULT] Best assignment from parallel runs with score: {highest_score}")
             print("-" * 50)
             #print(f"{'Player':<25} {'Hydra':<15} {'Head':<15}")
@@ -443,7 +967,34 @@ if __name__ == "__main__":
             #        print(f"{player:<25} {hydra_name:<15} {head_name:<15}")
             #print("-" * 50)
 
-        
+        elif input_string == "PT":
+            print("[INFO] Running parallel tempering...")
+            best_assignment, highest_score = run_parallel_tempering(simulator.csv_path)
+            print(f"\n[FINAL RESULT] Best assignment from parallel tempering with score: {highest_score}")
+            print("-" * 50)
+
+        elif input_string == "TS":
+            print("[INFO] Running tabu search...")
+            best_assignment, highest_score = simulator.run_tabu_search()
+            print(f"\n[FINAL RESULT] Best assignment from tabu search with score: {highest_score}")
+            print("-" * 50)
+
+        elif input_string == "PTS":
+            try:
+                n_sim = int(input("Enter number of tabu searches to run: "))
+            except ValueError:
+                n_sim = 8  # default fallback
+            print("[INFO] Running parallel tabu searches...")
+            best_assignment, highest_score = run_parallel_simulations(simulator.csv_path, n_simulations=n_sim,
+                                                                      seeding="greedy-randomized", optimizer="tabu")
+            print(f"\n[FINAL RESULT] Best assignment from parallel tabu search with score: {highest_score}")
+            print("-" * 50)
+
+        elif input_string == "GA":
+            print("[INFO] Running genetic optimizer...")
+            best_assignment, highest_score = simulator.run_genetic()
+            print(f"\n[FINAL RESULT] Best assignment from the genetic optimizer with score: {highest_score}")
+            print("-" * 50)
             
         else:
             print("[INFO] Running brute force simulation...")
@@ -455,16 +1006,10 @@ if __name__ == "__main__":
                 print(f"{best}")
             print("-" * 50)
 
-        # For use in print_assignment_summary
-        # Reset hydras and players so healths and attacks_left are fresh
-        simulator.reset_battle_state()
-
-        # Apply the best assignment to update heads' health properly
-        cycle = Cycle(simulator.players, simulator.hydras)
-        cycle.apply_assignment(best_assignment)
-
-        # Now print the summary with correct health states
+        # The reports replay best_assignment themselves to get the final head states
         simulator.print_assignment_summary(best_assignment, highest_score)
         simulator.export_assignment_summary_csv(best_assignment, highest_score, "my_hydra_summary.csv")
+        if input("Show expected score and kill chances over damage rolls? (y/N): ").strip().lower() == "y":
+            simulator.print_robustness(best_assignment, highest_score)
 
     